@@ -1,14 +1,429 @@
 import streamlit as st
+import asyncio
+import hashlib
+import json
 import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv, find_dotenv
+from types import SimpleNamespace
+from dotenv import load_dotenv
+
 try:
-    from openai import OpenAI  # type: ignore
+    import orjson  # C-extension JSON; optional, stdlib json is the fallback
 except Exception:
-    OpenAI = None  # type: ignore
+    orjson = None
+
+
+# Lazy, cached module accessors. Streamlit reruns this script on every widget
+# interaction, so heavy imports (PDF/DOCX stack, OpenAI SDK) are deferred until
+# the page that needs them runs, and cached for the life of the process.
+@st.cache_resource
+def _dotenv_path():
+    from dotenv import find_dotenv
+    return find_dotenv()
+
+
+@st.cache_resource
+def _parser():
+    from utils.parser import parse_resume, extract_text_from_pdf, extract_text_from_docx
+    return SimpleNamespace(
+        parse_resume=parse_resume,
+        extract_text_from_pdf=extract_text_from_pdf,
+        extract_text_from_docx=extract_text_from_docx,
+    )
+
+
+@st.cache_resource
+def _ats_scorer():
+    from utils.ats_scorer import calculate_ats_score
+    return SimpleNamespace(calculate_ats_score=calculate_ats_score)
+
+
+@st.cache_resource
+def _ai_enhancer():
+    from utils.ai_enhancer import enhance_resume_content, enhance_resume_content_stream
+    return SimpleNamespace(
+        enhance_resume_content=enhance_resume_content,
+        enhance_resume_content_stream=enhance_resume_content_stream,
+    )
+
+
+@st.cache_resource
+def _recommender():
+    from utils.openai_recommender import (
+        generate_recommendations,
+        submit_recommendations_batch,
+        retrieve_recommendations_batch,
+    )
+    return SimpleNamespace(
+        generate_recommendations=generate_recommendations,
+        submit_recommendations_batch=submit_recommendations_batch,
+        retrieve_recommendations_batch=retrieve_recommendations_batch,
+    )
+
+
+@st.cache_resource
+def _template_manager():
+    from utils.template_manager import get_available_templates, apply_template
+    return SimpleNamespace(
+        get_available_templates=get_available_templates,
+        apply_template=apply_template,
+    )
+
+
+@st.cache_resource
+def _file_generator():
+    from utils.file_generator import (
+        generate_docx,
+        generate_pdf,
+        generate_docx_bytes,
+        generate_pdf_bytes,
+    )
+    return SimpleNamespace(
+        generate_docx=generate_docx,
+        generate_pdf=generate_pdf,
+        generate_docx_bytes=generate_docx_bytes,
+        generate_pdf_bytes=generate_pdf_bytes,
+    )
+
+
+@st.cache_resource
+def _openai_sdk():
+    try:
+        from openai import OpenAI  # type: ignore
+    except Exception:
+        OpenAI = None  # type: ignore
+    return SimpleNamespace(OpenAI=OpenAI)
+
+
+@st.cache_resource
+def _available_templates():
+    # Template metadata is static for the life of the process.
+    return _template_manager().get_available_templates()
+
+
+@st.cache_resource
+def _openai_status():
+    # The API key doesn't change mid-process; compute the sidebar status once.
+    present = bool(os.getenv("OPENAI_API_KEY"))
+    msg = "OpenAI API: detected" if present else "OpenAI API: not detected"
+    return msg, present
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_score(data_json: str):
+    return _ats_scorer().calculate_ats_score(json.loads(data_json))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _extract_cached(name: str, data: bytes) -> str:
+    # Keyed on the uploaded bytes so the chatbot doesn't re-parse the same
+    # PDF/DOCX on every rerun (chip clicks, sends, any widget change).
+    if name.lower().endswith(".pdf"):
+        return _parser().extract_text_from_pdf(BytesIO(data))
+    return _parser().extract_text_from_docx(BytesIO(data))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_recs(content_key: str, score_key: str, role: str):
+    # Keyed on canonical JSON so clicking "Enhance" twice with identical
+    # inputs doesn't pay for a second OpenAI round-trip.
+    return _recommender().generate_recommendations(
+        json.loads(content_key), json.loads(score_key), target_role=role
+    )
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _docx_bytes(data_json: str, template: str) -> bytes:
+    return _file_generator().generate_docx_bytes(json.loads(data_json), template)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _pdf_bytes(data_json: str, template: str) -> bytes:
+    return _file_generator().generate_pdf_bytes(json.loads(data_json), template)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _parse_resume_cached(text_hash: str, text: str):
+    """Parse extracted resume text, keyed on its content hash.
+
+    Different files can extract to identical text (e.g. a re-export), so this
+    memoizes the regex/NLP pass independently of the file-level cache.
+    """
+    return _parser().parse_resume(text)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _parse_uploaded_file(file_hash: str, name: str, data: bytes):
+    """Extract and parse an uploaded resume, keyed on its content hash."""
+    from io import BytesIO
+    parser = _parser()
+    if name.endswith('.pdf'):
+        text = parser.extract_text_from_pdf(BytesIO(data))
+    else:
+        text = parser.extract_text_from_docx(BytesIO(data))
+    text_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    return _parse_resume_cached(text_hash, text)
+
+
+def _score_resume(data):
+    """Score a resume dict, memoized on its canonical JSON form.
+
+    Streamlit's default hasher struggles with deeply nested dicts, so the
+    cache key is the sorted JSON string instead.
+    """
+    return _cached_score(json.dumps(data, sort_keys=True))
+
+
+@lru_cache(maxsize=128)
+def _normalize_skills(raw: str) -> tuple:
+    """Split a comma-separated skills string into cleaned tokens."""
+    return tuple(s.strip() for s in raw.split(',') if s.strip())
+
+
+CONTACT_KEYS = ("email", "phone", "linkedin", "github", "website", "location")
+
+# Resolved once at import so per-call os.getenv lookups disappear
+OPENAI_MODEL = os.getenv("OPENAI_MODEL") or "gpt-4o-mini"
+
+# Character budget for the chatbot context block
+MAX_CHAT_CTX = 6000
+
+# Scoring rubric shown on the Score Tracker page — hoisted so the ~1KB
+# literal isn't rebuilt inside the expander on every rerun
+_RUBRIC_MD = """
+- **Overall score** = 30% Completeness + 40% Keyword Relevance + 30% Formatting/Readability.
+- **Completeness (30 pts)**
+  - Has contact details with email and either phone or a link (LinkedIn/GitHub) (up to 8 pts)
+  - Professional summary present (6 pts)
+  - Sufficient skills listed (target ≥ 8) (6 pts)
+  - Education section present (5 pts)
+  - Experience section present (5 pts)
+- **Keyword Relevance (40 pts)**
+  - Skills richness: more distinct, relevant skills → up to 20 pts
+  - Reuse of those skills/keywords in summary and bullets → up to 15 pts
+  - Role/title signals (e.g., Engineer, Senior) → up to 5 pts
+- **Formatting/Readability (30 pts)**
+  - Adequate number of strong bullet points in experience → up to 8 pts
+  - Use of action verbs (Led, Built, Optimized, Delivered, etc.) → up to 8 pts
+  - Quantified impact (numbers, %, x) → up to 7 pts
+  - Consistent dates across roles → up to 5 pts
+  - Links present (LinkedIn/GitHub) → up to 2 pts
+"""
+
+# Quick-prompt chips for the feedback chatbot
+CHIPS = (
+    "How can I improve my professional summary?",
+    "Which keywords am I missing for a Data Scientist role?",
+    "Rewrite my last job bullets to be more impact-driven.",
+    "Suggest better formatting for ATS.",
+)
+
+
+def _prompt_json(obj):
+    """Serialize a resume dict to indented JSON for LLM prompts."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+SCORE_HISTORY_LIMIT = 20
+
+
+def _append_score_history(label, score_data):
+    """Record a scoring step, bounded so long sessions don't grow session state.
+
+    Only the most recent two entries keep their full breakdown; older entries
+    keep just the headline numbers (the tracker can recompute on demand).
+    """
+    hist = st.session_state.score_history
+    hist.append({
+        "label": label,
+        "overall": score_data['score'],
+        "keywords": score_data['keyword_score'],
+        "format": score_data['format_score'],
+        "breakdown": score_data.get('breakdown', {}),
+    })
+    del hist[:-SCORE_HISTORY_LIMIT]
+    for entry in hist[:-2]:
+        entry.pop('breakdown', None)
+
+
+async def _rescore_and_recommend(enhanced_data, seed_score, target_role):
+    """Run the post-enhancement rescore and the recommendation call concurrently.
+
+    Recommendations only need a representative score to prioritize against, so
+    they are seeded with the (cheap, deterministic) baseline score instead of
+    waiting on the enhanced rescore — this hides one full OpenAI round-trip.
+    """
+    scorer = _ats_scorer().calculate_ats_score
+    return await asyncio.gather(
+        asyncio.to_thread(scorer, enhanced_data),
+        asyncio.to_thread(
+            _cached_recs,
+            json.dumps(enhanced_data, sort_keys=True),
+            json.dumps(seed_score or {}, sort_keys=True),
+            target_role,
+        ),
+    )
+
+
+@st.fragment
+def _render_enhancement_preview():
+    """Render the enhanced-content preview from session state.
+
+    Decorated with st.fragment so widget interactions inside the preview
+    (expander toggles etc.) rerun only this block, not the whole script.
+    """
+    enhanced_data = st.session_state.get("enhanced_content") or {}
+    enhanced_score = st.session_state.get("enhanced_score") or {}
+
+    # Show improvement
+    col1, col2, col3 = st.columns(3)
+
+    if st.session_state.original_score and enhanced_score:
+        original = st.session_state.original_score['score']
+        enhanced = enhanced_score['score']
+        improvement = enhanced - original
+
+        with col1:
+            st.metric("Original Score", f"{original}/100")
+        with col2:
+            st.metric("Enhanced Score", f"{enhanced}/100", delta=f"+{improvement}")
+        with col3:
+            improvement_pct = (improvement / original * 100) if original > 0 else 0
+            st.metric("Improvement", f"{improvement_pct:.1f}%")
+
+    # Show enhanced content preview
+    st.subheader("Enhanced Content Preview")
+
+    personal = enhanced_data.get('personal_info', {}) or {}
+    skills = enhanced_data.get('skills', []) or []
+    education = enhanced_data.get('education', []) or []
+    experience = enhanced_data.get('experience', []) or []
+    projects = enhanced_data.get('projects', []) or []
+
+    # Summary
+    if personal.get('summary'):
+        st.markdown("**Enhanced Professional Summary:**")
+        st.info(personal['summary'])
+
+    # Contact + Skills
+    colA, colB = st.columns(2)
+    with colA:
+        contact = " | ".join(str(personal[k]) for k in CONTACT_KEYS if personal.get(k))
+        if contact:
+            st.write(f"**Contact:** {contact}")
+    with colB:
+        if skills:
+            st.markdown("**Skills:**")
+            st.write(" ".join([f"`{s}`" for s in skills]))
+
+    # Education/Experience/Projects are emitted as one markdown
+    # blob per section — each st.markdown is a separate delta
+    # over the websocket, so per-bullet calls add up fast.
+    if education:
+        lines = ["---", "**Education:**"]
+        lines.extend(f"- {e}" for e in education)
+        st.markdown("\n".join(lines))
+
+    if experience:
+        lines = ["---", "**Experience:**"]
+        for job in experience:
+            jt = job.get('title', '')
+            co = job.get('company', '')
+            dt = job.get('dates', '')
+            header = f"{jt} — {co} ({dt})".strip()
+            lines.append(f"- **{header}**")
+            lines.extend(f"  - {b}" for b in job.get('responsibilities', []) or [])
+        st.markdown("\n".join(lines))
+
+    if projects:
+        lines = ["---", "**Projects:**"]
+        for p in projects:
+            name = p.get('name', 'Project')
+            desc = p.get('description', '')
+            tech = p.get('technologies', '')
+            line = f"**{name}**"
+            if tech:
+                line += f" ({tech})"
+            lines.append(f"- {line}")
+            if desc:
+                lines.append(f"  - {desc}")
+        st.markdown("\n".join(lines))
+
+    # Show AI recommendations inline
+    if st.session_state.get("recommendations"):
+        st.markdown("---")
+        recs = st.session_state.recommendations
+        provider = recs.get("provider", "fallback")
+        st.subheader(f"🔍 AI Recommendations  ·  source: {provider}")
+        st.markdown(f"**Summary:** {recs.get('summary','')} ")
+        with st.expander("Show detailed suggestions", expanded=True):
+            st.markdown("\n".join(
+                f"- **{r.get('title','')}** — {r.get('detail','')} _(impact: {r.get('impact_estimate','')}, category: {r.get('category','n/a')})_"
+                for r in recs.get("recommendations", [])
+            ))
+        if recs.get("keywords_to_add"):
+            st.markdown("**Keywords to consider adding:**")
+            st.write(", ".join(recs["keywords_to_add"]))
+        if provider == "fallback":
+            if recs.get("error"):
+                st.warning(f"OpenAI error: {recs.get('error')}")
+            st.info("No OpenAI API key detected or API unavailable. Showing deterministic fallback recommendations.")
+
+    st.info("💡 Proceed to 'Generate Resume' to create your final document!")
+
+
+@st.fragment
+def _render_score_tracker_history():
+    """Render the score-history chart and per-step breakdowns as a fragment.
+
+    Expanding a breakdown reruns only this block instead of the full page.
+    """
+    hist = st.session_state.get("score_history", [])
+    if not hist:
+        st.info("No scores yet. Compute a baseline or run an enhancement.")
+        return
+    # Single pass over history into a columnar frame — st.bar_chart converts
+    # dicts to a DataFrame internally anyway, so hand it one directly.
+    df = pd.DataFrame(
+        [
+            {"Overall": h.get("overall", 0), "Keywords": h.get("keywords", 0), "Format": h.get("format", 0)}
+            for h in hist
+        ],
+        index=[h.get("label", "step") for h in hist],
+    )
+    st.bar_chart(df)
+    st.markdown("### History")
+    for i, h in enumerate(hist, 1):
+        st.write(f"{i}. {h.get('label','step')} — Overall {h.get('overall')} | Keywords {h.get('keywords')} | Format {h.get('format')}")
+        with st.expander("Show breakdown", expanded=False):
+            bd = h.get('breakdown') or {}
+            # Recompute only on explicit request so collapsed entries never
+            # hit the scorer (cached or not) during reruns
+            if not bd and st.checkbox("Compute breakdown", key=f"expand_{i}"):
+                data_src = None
+                if (h.get('label') == 'baseline') and st.session_state.get('resume_data'):
+                    data_src = st.session_state.resume_data
+                elif (h.get('label') == 'enhanced') and st.session_state.get('enhanced_content'):
+                    data_src = st.session_state.enhanced_content
+                if data_src:
+                    try:
+                        tmp = _score_resume(data_src)
+                        bd = tmp.get('breakdown', {}) or {}
+                    except Exception as _:
+                        bd = {}
+            if bd:
+                st.json(bd)
+            else:
+                st.caption("No breakdown available for this historical entry.")
+
 
 # Load environment variables from .env (robust to working directory)
-load_dotenv(find_dotenv(), override=False)
+load_dotenv(_dotenv_path(), override=False)
 
 # Page config
 st.set_page_config(
@@ -36,21 +451,13 @@ if 'chat_input' not in st.session_state:
 if 'reset_chat_input' not in st.session_state:
     st.session_state.reset_chat_input = False
 
-# Import modules
-from utils.parser import parse_resume, extract_text_from_pdf, extract_text_from_docx
-from utils.ats_scorer import calculate_ats_score
-from utils.ai_enhancer import enhance_resume_content
-from utils.template_manager import get_available_templates, apply_template
-from utils.file_generator import generate_docx, generate_pdf
-from utils.openai_recommender import generate_recommendations
-
 # Sidebar
 st.sidebar.title("📄 AI Resume Builder")
 st.sidebar.markdown("---")
 
-# Show OpenAI API detection status
-_openai_present = bool(os.getenv("OPENAI_API_KEY"))
-status_msg = "OpenAI API: detected" if _openai_present else "OpenAI API: not detected"
+# Show OpenAI API detection status (computed once per process — the key
+# doesn't change between reruns, so no point re-reading the env each time)
+status_msg, _openai_present = _openai_status()
 status_fn = st.sidebar.success if _openai_present else st.sidebar.warning
 status_fn(status_msg)
 page = st.sidebar.radio(
@@ -105,76 +512,82 @@ elif page == "Upload Resume":
     )
     
     if uploaded_file:
-        with st.spinner("Parsing your resume..."):
-            try:
-                # Extract text based on file type
-                if uploaded_file.name.endswith('.pdf'):
-                    text = extract_text_from_pdf(uploaded_file)
-                else:
-                    text = extract_text_from_docx(uploaded_file)
-                
-                # Parse the resume
-                resume_data = parse_resume(text)
-                st.session_state.resume_data = resume_data
-                
-                st.success("✅ Resume parsed successfully!")
-                
-                # Display parsed data
-                st.subheader("Extracted Information")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if resume_data.get('personal_info'):
-                        st.markdown("**Personal Information**")
-                        st.json(resume_data['personal_info'])
-                    
-                    if resume_data.get('skills'):
-                        st.markdown("**Skills**")
-                        st.write(", ".join(resume_data['skills']))
-                
-                with col2:
-                    if resume_data.get('education'):
-                        st.markdown("**Education**")
-                        for edu in resume_data['education']:
-                            st.write(f"- {edu}")
-                    
-                    if resume_data.get('experience'):
-                        st.markdown("**Experience**")
-                        st.write(f"{len(resume_data['experience'])} positions found")
-                
-                # Calculate initial ATS score
-                if st.button("📊 Calculate ATS Score", type="primary"):
-                    with st.spinner("Calculating ATS score..."):
-                        score_data = calculate_ats_score(resume_data)
-                        st.session_state.original_score = score_data
-                        st.session_state.score_history.append({
-                            "label": "baseline",
-                            "overall": score_data['score'],
-                            "keywords": score_data['keyword_score'],
-                            "format": score_data['format_score'],
-                            "breakdown": score_data.get('breakdown', {}),
-                        })
-                        
-                        st.subheader("ATS Score Analysis")
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Overall Score", f"{score_data['score']}/100")
-                        with col2:
-                            st.metric("Keyword Match", f"{score_data['keyword_score']}/100")
-                        with col3:
-                            st.metric("Format Score", f"{score_data['format_score']}/100")
-                        
-                        if score_data.get('suggestions'):
-                            st.markdown("**Improvement Suggestions:**")
-                            for suggestion in score_data['suggestions']:
-                                st.write(f"- {suggestion}")
-                        
-                        st.info("💡 Proceed to the Enhancement page to improve your resume!")
-                
-            except Exception as e:
-                st.error(f"Error parsing resume: {str(e)}")
+        # Fingerprint the upload so reruns (e.g. clicking Calculate ATS Score)
+        # don't re-run the extract/parse pipeline on the same bytes.
+        file_bytes = uploaded_file.getvalue()
+        file_hash = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+        resume_data = None
+        if st.session_state.get('last_upload_hash') == file_hash and st.session_state.resume_data:
+            resume_data = st.session_state.resume_data
+        else:
+            with st.spinner("Parsing your resume..."):
+                try:
+                    resume_data = _parse_uploaded_file(file_hash, uploaded_file.name, file_bytes)
+                    st.session_state.resume_data = resume_data
+                    st.session_state.last_upload_hash = file_hash
+                    st.success("✅ Resume parsed successfully!")
+                except Exception as e:
+                    st.error(f"Error parsing resume: {str(e)}")
+
+        if resume_data:
+            # Display parsed data
+            st.subheader("Extracted Information")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                if resume_data.get('personal_info'):
+                    st.markdown("**Personal Information**")
+                    if st.toggle("Show details", value=True, key="show_personal_info"):
+                        # Flat key/value data renders faster as a dataframe
+                        # than through the heavy st.json viewer component.
+                        st.dataframe(
+                            pd.DataFrame(
+                                resume_data['personal_info'].items(),
+                                columns=["Field", "Value"],
+                            ),
+                            hide_index=True,
+                            use_container_width=True,
+                        )
+
+                if resume_data.get('skills'):
+                    st.markdown("**Skills**")
+                    st.write(", ".join(resume_data['skills']))
+
+            with col2:
+                if resume_data.get('education'):
+                    st.markdown("**Education**")
+                    for edu in resume_data['education']:
+                        st.write(f"- {edu}")
+
+                if resume_data.get('experience'):
+                    st.markdown("**Experience**")
+                    st.write(f"{len(resume_data['experience'])} positions found")
+
+            # Calculate initial ATS score
+            if st.button("📊 Calculate ATS Score", type="primary"):
+                with st.spinner("Calculating ATS score..."):
+                    score_data = _score_resume(resume_data)
+                    st.session_state.original_score = score_data
+                    _append_score_history("baseline", score_data)
+
+                    st.subheader("ATS Score Analysis")
+
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Overall Score", f"{score_data['score']}/100")
+                    with col2:
+                        st.metric("Keyword Match", f"{score_data['keyword_score']}/100")
+                    with col3:
+                        st.metric("Format Score", f"{score_data['format_score']}/100")
+
+                    if score_data.get('suggestions'):
+                        st.markdown("**Improvement Suggestions:**")
+                        for suggestion in score_data['suggestions']:
+                            st.write(f"- {suggestion}")
+
+                    st.info("💡 Proceed to the Enhancement page to improve your resume!")
 
 elif page == "Manual Entry":
     st.title("✍️ Enter Resume Details Manually")
@@ -196,22 +609,14 @@ elif page == "Manual Entry":
         summary = st.text_area("Professional Summary", placeholder="Brief overview of your professional background...", height=100)
         
         st.subheader("Education")
-        num_education = st.number_input("Number of education entries", min_value=1, max_value=5, value=1)
-        education_entries = []
-        for i in range(num_education):
-            with st.expander(f"Education {i+1}"):
-                degree = st.text_input(f"Degree/Certification {i+1}", key=f"degree_{i}")
-                institution = st.text_input(f"Institution {i+1}", key=f"institution_{i}")
-                edu_dates = st.text_input(f"Dates {i+1}", placeholder="2018 - 2022", key=f"edu_dates_{i}")
-                gpa = st.text_input(f"GPA (optional) {i+1}", key=f"gpa_{i}")
-                if degree and institution:
-                    education_entries.append({
-                        "degree": degree,
-                        "institution": institution,
-                        "dates": edu_dates,
-                        "gpa": gpa
-                    })
-        
+        st.caption("Add one row per degree/certification.")
+        edu_df = st.data_editor(
+            pd.DataFrame(columns=["degree", "institution", "dates", "gpa"]),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="edu_editor",
+        )
+
         st.subheader("Skills")
         skills = st.text_area(
             "Skills (comma-separated)",
@@ -220,53 +625,47 @@ elif page == "Manual Entry":
         )
         
         st.subheader("Work Experience")
-        num_experience = st.number_input("Number of work experiences", min_value=1, max_value=10, value=2)
-        experience_entries = []
-        for i in range(num_experience):
-            with st.expander(f"Experience {i+1}"):
-                job_title = st.text_input(f"Job Title {i+1}", key=f"job_title_{i}")
-                company = st.text_input(f"Company {i+1}", key=f"company_{i}")
-                exp_dates = st.text_input(f"Dates {i+1}", placeholder="Jan 2022 - Present", key=f"exp_dates_{i}")
-                responsibilities = st.text_area(
-                    f"Responsibilities & Achievements {i+1}",
-                    placeholder="- Led team of 5 developers\n- Increased efficiency by 40%",
-                    key=f"responsibilities_{i}",
-                    height=150
-                )
-                if job_title and company:
-                    experience_entries.append({
-                        "title": job_title,
-                        "company": company,
-                        "dates": exp_dates,
-                        "responsibilities": responsibilities.split('\n') if responsibilities else []
-                    })
-        
+        st.caption("Add one row per role; separate responsibilities with newlines.")
+        exp_df = st.data_editor(
+            pd.DataFrame(columns=["title", "company", "dates", "responsibilities"]),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="exp_editor",
+        )
+
         st.subheader("Projects")
-        num_projects = st.number_input("Number of projects", min_value=0, max_value=10, value=2)
-        project_entries = []
-        for i in range(num_projects):
-            with st.expander(f"Project {i+1}"):
-                project_name = st.text_input(f"Project Name {i+1}", key=f"project_name_{i}")
-                project_desc = st.text_area(
-                    f"Description {i+1}",
-                    placeholder="Brief description of the project and your role",
-                    key=f"project_desc_{i}",
-                    height=100
-                )
-                project_tech = st.text_input(f"Technologies Used {i+1}", key=f"project_tech_{i}")
-                if project_name:
-                    project_entries.append({
-                        "name": project_name,
-                        "description": project_desc,
-                        "technologies": project_tech
-                    })
-        
+        proj_df = st.data_editor(
+            pd.DataFrame(columns=["name", "description", "technologies"]),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="proj_editor",
+        )
+
         submitted = st.form_submit_button("💾 Save Resume Data", type="primary")
-        
+
         if submitted:
             if not name or not email:
                 st.error("Please fill in required fields (Name and Email)")
             else:
+                education_entries = [
+                    row for row in edu_df.fillna("").astype(str).to_dict("records")
+                    if row.get("degree") and row.get("institution")
+                ]
+                experience_entries = []
+                for row in exp_df.fillna("").astype(str).to_dict("records"):
+                    if not (row.get("title") and row.get("company")):
+                        continue
+                    resp = row.get("responsibilities", "")
+                    experience_entries.append({
+                        "title": row["title"],
+                        "company": row["company"],
+                        "dates": row.get("dates", ""),
+                        "responsibilities": [b.strip() for b in resp.split('\n') if b.strip()] if resp else []
+                    })
+                project_entries = [
+                    row for row in proj_df.fillna("").astype(str).to_dict("records")
+                    if row.get("name")
+                ]
                 resume_data = {
                     "personal_info": {
                         "name": name,
@@ -279,7 +678,7 @@ elif page == "Manual Entry":
                         "summary": summary
                     },
                     "education": education_entries,
-                    "skills": [s.strip() for s in skills.split(',') if s.strip()],
+                    "skills": list(_normalize_skills(skills)),
                     "experience": experience_entries,
                     "projects": project_entries
                 }
@@ -293,15 +692,9 @@ elif page == "Manual Entry":
     if st.session_state.resume_data:
         if st.button("📊 Calculate ATS Score"):
             with st.spinner("Calculating ATS score..."):
-                score_data = calculate_ats_score(st.session_state.resume_data)
+                score_data = _score_resume(st.session_state.resume_data)
                 st.session_state.original_score = score_data
-                st.session_state.score_history.append({
-                    "label": "baseline",
-                    "overall": score_data['score'],
-                    "keywords": score_data['keyword_score'],
-                    "format": score_data['format_score'],
-                    "breakdown": score_data.get('breakdown', {}),
-                })
+                _append_score_history("baseline", score_data)
                 
                 st.subheader("ATS Score Analysis")
                 col1, col2, col3 = st.columns(3)
@@ -320,8 +713,9 @@ elif page == "Enhancement":
     else:
         st.markdown("Enhance your resume content using AI for better ATS compatibility and professional presentation.")
         
-        # Show current data
-        with st.expander("📋 Current Resume Data"):
+        # Show current data only on request — st.json ships the full payload
+        # over the websocket on every rerun, even inside a collapsed expander.
+        if st.toggle("📋 Show raw resume JSON", value=False, key="show_raw"):
             st.json(st.session_state.resume_data)
         
         if st.session_state.original_score:
@@ -341,143 +735,96 @@ elif page == "Enhancement":
                 value="Moderate"
             )
         
+        recs_in_background = st.checkbox(
+            "Run recommendations in background (cheaper)",
+            value=False,
+            help="Routes the OpenAI recommendations call through the Batch API "
+                 "(~50% cheaper). Results appear under 'Pending batches' below."
+        )
+
         if st.button("✨ Enhance with AI", type="primary"):
             with st.spinner("AI is enhancing your resume... This may take a moment."):
                 try:
-                    enhanced_data, modifications = enhance_resume_content(
+                    # Stream partial results into a placeholder as each stage
+                    # finishes rather than blocking on the full enhancement.
+                    progress = st.empty()
+                    enhanced_data, modifications = {}, []
+                    for enhanced_data, modifications in _ai_enhancer().enhance_resume_content_stream(
                         st.session_state.resume_data,
                         target_role=target_role,
                         enhancement_level=enhancement_level.lower()
-                    )
-                    
+                    ):
+                        draft = (enhanced_data.get('personal_info', {}) or {}).get('summary', '')
+                        if draft:
+                            progress.info(f"✍️ {draft}")
+                    progress.empty()
+
                     st.session_state.enhanced_content = enhanced_data
                     st.session_state["modifications"] = modifications
-                    
-                    # Recalculate ATS score
-                    enhanced_score = calculate_ats_score(enhanced_data)
+
+                    # Rescore and fetch AI recommendations concurrently; recs
+                    # are seeded with the baseline score so they don't have to
+                    # wait on the rescore.
+                    seed_score = st.session_state.original_score or _score_resume(st.session_state.resume_data)
+                    if recs_in_background:
+                        # Non-interactive path: submit through the Batch API
+                        # and collect later from the pending-batches panel.
+                        enhanced_score = _score_resume(enhanced_data)
+                        try:
+                            batch_id = _recommender().submit_recommendations_batch(
+                                enhanced_data, enhanced_score, target_role=target_role or ""
+                            )
+                            st.session_state.setdefault("pending_batches", []).append(batch_id)
+                            st.info("Recommendations submitted as a background batch — check 'Pending batches' below.")
+                        except Exception as batch_err:
+                            st.warning(f"Batch submission failed ({batch_err}); running inline instead.")
+                            _, recs = asyncio.run(
+                                _rescore_and_recommend(enhanced_data, seed_score, target_role or "")
+                            )
+                            st.session_state.recommendations = recs
+                    else:
+                        enhanced_score, recs = asyncio.run(
+                            _rescore_and_recommend(enhanced_data, seed_score, target_role or "")
+                        )
+                        st.session_state.recommendations = recs
                     st.session_state.enhanced_score = enhanced_score
-                    st.session_state.score_history.append({
-                        "label": "enhanced",
-                        "overall": enhanced_score['score'],
-                        "keywords": enhanced_score['keyword_score'],
-                        "format": enhanced_score['format_score'],
-                        "breakdown": enhanced_score.get('breakdown', {}),
-                    })
+                    _append_score_history("enhanced", enhanced_score)
 
-                    # Generate AI recommendations (OpenAI if key present, else deterministic)
-                    recs = generate_recommendations(
-                        st.session_state.enhanced_content or st.session_state.resume_data,
-                        st.session_state.enhanced_score or st.session_state.original_score,
-                        target_role=target_role or ""
-                    )
-                    st.session_state.recommendations = recs
-                    
                     st.success("✅ Enhancement complete!")
-                    
-                    # Show improvement
-                    col1, col2, col3 = st.columns(3)
-                    
-                    if st.session_state.original_score:
-                        original = st.session_state.original_score['score']
-                        enhanced = enhanced_score['score']
-                        improvement = enhanced - original
-                        
-                        with col1:
-                            st.metric("Original Score", f"{original}/100")
-                        with col2:
-                            st.metric("Enhanced Score", f"{enhanced}/100", delta=f"+{improvement}")
-                        with col3:
-                            improvement_pct = (improvement / original * 100) if original > 0 else 0
-                            st.metric("Improvement", f"{improvement_pct:.1f}%")
-                    
-                    # Show enhanced content preview
-                    st.subheader("Enhanced Content Preview")
-                    
-                    personal = enhanced_data.get('personal_info', {}) or {}
-                    skills = enhanced_data.get('skills', []) or []
-                    education = enhanced_data.get('education', []) or []
-                    experience = enhanced_data.get('experience', []) or []
-                    projects = enhanced_data.get('projects', []) or []
-
-                    # Summary
-                    if personal.get('summary'):
-                        st.markdown("**Enhanced Professional Summary:**")
-                        st.info(personal['summary'])
-
-                    # Contact + Skills
-                    colA, colB = st.columns(2)
-                    with colA:
-                        contact_parts = []
-                        for k in ["email", "phone", "linkedin", "github", "website", "location"]:
-                            v = personal.get(k)
-                            if v:
-                                contact_parts.append(str(v))
-                        if contact_parts:
-                            st.markdown("**Contact:**")
-                            st.write(" | ".join(contact_parts))
-                    with colB:
-                        if skills:
-                            st.markdown("**Skills:**")
-                            st.write(" ".join([f"`{s}`" for s in skills]))
-
-                    # Education
-                    if education:
-                        st.markdown("---")
-                        st.markdown("**Education:**")
-                        for e in education:
-                            st.markdown(f"- {e}")
-
-                    # Experience
-                    if experience:
-                        st.markdown("---")
-                        st.markdown("**Experience:**")
-                        for job in experience:
-                            jt = job.get('title', '')
-                            co = job.get('company', '')
-                            dt = job.get('dates', '')
-                            header = f"{jt} — {co} ({dt})".strip()
-                            st.markdown(f"- **{header}**")
-                            for b in job.get('responsibilities', []) or []:
-                                st.markdown(f"  - {b}")
-
-                    # Projects
-                    if projects:
-                        st.markdown("---")
-                        st.markdown("**Projects:**")
-                        for p in projects:
-                            name = p.get('name', 'Project')
-                            desc = p.get('description', '')
-                            tech = p.get('technologies', '')
-                            line = f"**{name}**"
-                            if tech:
-                                line += f" ({tech})"
-                            st.markdown(f"- {line}")
-                            if desc:
-                                st.markdown(f"  - {desc}")
-                    
-                    # Show AI recommendations inline
-                    if st.session_state.get("recommendations"):
-                        st.markdown("---")
-                        recs = st.session_state.recommendations
-                        provider = recs.get("provider", "fallback")
-                        st.subheader(f"🔍 AI Recommendations  ·  source: {provider}")
-                        st.markdown(f"**Summary:** {recs.get('summary','')} ")
-                        with st.expander("Show detailed suggestions", expanded=True):
-                            for r in recs.get("recommendations", []):
-                                st.markdown(f"- **{r.get('title','')}** — {r.get('detail','')} _(impact: {r.get('impact_estimate','')}, category: {r.get('category','n/a')})_")
-                        if recs.get("keywords_to_add"):
-                            st.markdown("**Keywords to consider adding:**")
-                            st.write(", ".join(recs["keywords_to_add"]))
-                        if provider == "fallback":
-                            if recs.get("error"):
-                                st.warning(f"OpenAI error: {recs.get('error')}")
-                            st.info("No OpenAI API key detected or API unavailable. Showing deterministic fallback recommendations.")
-
-                    st.info("💡 Proceed to 'Generate Resume' to create your final document!")
-                    
+
                 except Exception as e:
                     st.error(f"Enhancement error: {str(e)}")
 
+        # Preview lives in a fragment and reads from session state, so it
+        # survives reruns and its widgets don't replay the whole script.
+        if st.session_state.get("enhanced_content"):
+            _render_enhancement_preview()
+
+        # Poll background recommendation batches only when the page is visited
+        if st.session_state.get("pending_batches"):
+            st.markdown("---")
+            st.subheader("⏳ Pending batches")
+            finished = []
+            for batch_id in st.session_state.pending_batches:
+                try:
+                    result = _recommender().retrieve_recommendations_batch(batch_id)
+                except Exception as poll_err:
+                    st.warning(f"Could not poll batch {batch_id}: {poll_err}")
+                    continue
+                if result.get("status") == "completed":
+                    if result.get("result"):
+                        st.session_state.recommendations = result["result"]
+                        st.success(f"Batch {batch_id} completed — recommendations updated.")
+                    else:
+                        st.warning(f"Batch {batch_id} completed but output could not be parsed: {result.get('error')}")
+                    finished.append(batch_id)
+                else:
+                    st.caption(f"{batch_id}: {result.get('status')}")
+            if finished:
+                st.session_state.pending_batches = [
+                    b for b in st.session_state.pending_batches if b not in finished
+                ]
+
 elif page == "Generate Resume":
     st.title("📥 Generate Your Resume")
     
@@ -490,7 +837,7 @@ elif page == "Generate Resume":
         
         # Template selection
         st.subheader("Choose Template")
-        templates = get_available_templates()
+        templates = _available_templates()
         
         cols = st.columns(len(templates))
         selected_template = None
@@ -513,15 +860,13 @@ elif page == "Generate Resume":
             if st.button("📄 Generate Word (.docx)", type="primary"):
                 with st.spinner("Generating Word document..."):
                     try:
-                        docx_path = generate_docx(content_to_use, selected_template)
-                        
-                        with open(docx_path, "rb") as file:
-                            st.download_button(
-                                label="⬇️ Download Word Resume",
-                                data=file,
-                                file_name="resume.docx",
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
+                        docx_data = _docx_bytes(json.dumps(content_to_use, sort_keys=True), selected_template)
+                        st.download_button(
+                            label="⬇️ Download Word Resume",
+                            data=docx_data,
+                            file_name="resume.docx",
+                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                        )
                         st.success("✅ Word document generated!")
                     except Exception as e:
                         st.error(f"Error generating Word document: {str(e)}")
@@ -530,15 +875,13 @@ elif page == "Generate Resume":
             if st.button("📕 Generate PDF", type="primary"):
                 with st.spinner("Generating PDF..."):
                     try:
-                        pdf_path = generate_pdf(content_to_use, selected_template)
-                        
-                        with open(pdf_path, "rb") as file:
-                            st.download_button(
-                                label="⬇️ Download PDF Resume",
-                                data=file,
-                                file_name="resume.pdf",
-                                mime="application/pdf"
-                            )
+                        pdf_data = _pdf_bytes(json.dumps(content_to_use, sort_keys=True), selected_template)
+                        st.download_button(
+                            label="⬇️ Download PDF Resume",
+                            data=pdf_data,
+                            file_name="resume.pdf",
+                            mime="application/pdf"
+                        )
                         st.success("✅ PDF generated!")
                     except Exception as e:
                         st.error(f"Error generating PDF: {str(e)}")
@@ -566,41 +909,36 @@ elif page == "Comparison":
             with c1:
                 if st.button("📊 Compute Baseline ATS", use_container_width=True):
                     with st.spinner("Calculating ATS score..."):
-                        st.session_state.original_score = calculate_ats_score(st.session_state.resume_data)
+                        st.session_state.original_score = _score_resume(st.session_state.resume_data)
                         st.success("Baseline ATS score computed.")
-                        st.session_state.score_history.append({
-                            "label": "baseline",
-                            "overall": st.session_state.original_score['score'],
-                            "keywords": st.session_state.original_score['keyword_score'],
-                            "format": st.session_state.original_score['format_score'],
-                            "breakdown": st.session_state.original_score.get('breakdown', {}),
-                        })
+                        _append_score_history("baseline", st.session_state.original_score)
             with c2:
                 if st.button("✨ Run Enhancement Now", use_container_width=True):
                     with st.spinner("Enhancing and rescoring..."):
-                        enhanced_data, modifications = enhance_resume_content(
+                        enhanced_data, modifications = _ai_enhancer().enhance_resume_content(
                             st.session_state.resume_data,
                             target_role="",
                             enhancement_level="moderate"
                         )
                         st.session_state.enhanced_content = enhanced_data
                         st.session_state["modifications"] = modifications
-                        st.session_state.enhanced_score = calculate_ats_score(enhanced_data)
-                        # Best-effort recommendations
-                        recs = generate_recommendations(
-                            enhanced_data,
-                            st.session_state.enhanced_score or {},
-                            target_role=""
+                        # Baseline and enhanced scoring are independent —
+                        # run both on a small thread pool; _score_resume
+                        # short-circuits on cache hits, so an existing
+                        # baseline costs nothing to re-request.
+                        with ThreadPoolExecutor(max_workers=2) as ex:
+                            f_base = ex.submit(_score_resume, st.session_state.resume_data)
+                            f_enh = ex.submit(_score_resume, enhanced_data)
+                            baseline_score = st.session_state.original_score or f_base.result()
+                            st.session_state.original_score = baseline_score
+                            st.session_state.enhanced_score = f_enh.result()
+                        st.session_state.recommendations = _cached_recs(
+                            json.dumps(enhanced_data, sort_keys=True),
+                            json.dumps(baseline_score or {}, sort_keys=True),
+                            "",
                         )
-                        st.session_state.recommendations = recs
                         st.success("Enhancement complete.")
-                        st.session_state.score_history.append({
-                            "label": "enhanced",
-                            "overall": st.session_state.enhanced_score['score'],
-                            "keywords": st.session_state.enhanced_score['keyword_score'],
-                            "format": st.session_state.enhanced_score['format_score'],
-                            "breakdown": st.session_state.enhanced_score.get('breakdown', {}),
-                        })
+                        _append_score_history("enhanced", st.session_state.enhanced_score)
         else:
             st.info("Please upload or enter your resume data first.")
     
@@ -642,31 +980,35 @@ elif page == "Comparison":
         recs = st.session_state.get("recommendations", {})
         rec_list = recs.get("recommendations", []) or []
 
+        # Index recommendations by section once instead of re-scanning (and
+        # re-lowercasing) the whole list for each of the five sections below.
+        _section_cats = {
+            'summary': ('content', 'sections', 'keywords'),
+            'skills': ('keywords', 'content'),
+            'education': ('sections', 'consistency'),
+            'experience': ('achievements', 'content'),
+            'projects': ('content', 'sections'),
+        }
+        section_map = {k: [] for k in _section_cats}
+        for r in rec_list:
+            cat = (r.get('category') or '').lower()
+            for section_key, cats in _section_cats.items():
+                if any(c in cat for c in cats):
+                    section_map[section_key].append(r)
+
         def show_section(title, render_original, section_key):
             st.markdown("---")
             st.markdown(f"#### {title}")
             st.markdown("**Original**")
             render_original()
             # Inline AI suggestions for this section
-            if rec_list:
-                section_suggestions = []
-                for r in rec_list:
-                    cat = (r.get('category') or '').lower()
-                    txt = (r.get('detail') or '') + ' ' + (r.get('title') or '')
-                    if section_key == 'summary' and ('content' in cat or 'sections' in cat or 'keywords' in cat):
-                        section_suggestions.append(r)
-                    elif section_key == 'skills' and ('keywords' in cat or 'content' in cat):
-                        section_suggestions.append(r)
-                    elif section_key == 'education' and ('sections' in cat or 'consistency' in cat):
-                        section_suggestions.append(r)
-                    elif section_key == 'experience' and ('achievements' in cat or 'content' in cat):
-                        section_suggestions.append(r)
-                    elif section_key == 'projects' and ('content' in cat or 'sections' in cat):
-                        section_suggestions.append(r)
-                if section_suggestions:
-                    with st.expander("AI suggestions for this section", expanded=True):
-                        for r in section_suggestions:
-                            st.markdown(f"- **{r.get('title','')}** — {r.get('detail','')} _(impact: {r.get('impact_estimate','')})_")
+            section_suggestions = section_map.get(section_key, [])
+            if section_suggestions:
+                with st.expander("AI suggestions for this section", expanded=True):
+                    st.markdown("\n".join(
+                        f"- **{r.get('title','')}** — {r.get('detail','')} _(impact: {r.get('impact_estimate','')})_"
+                        for r in section_suggestions
+                    ))
 
         # Summary
         def _orig_summary():
@@ -696,11 +1038,14 @@ elif page == "Comparison":
             if not jobs:
                 st.write("—")
                 return
+            # One markdown blob per render — each st.markdown call is a
+            # separate delta over the websocket
+            lines = []
             for j in jobs:
                 header = f"{j.get('title','')} — {j.get('company','')} ({j.get('dates','')})".strip()
-                st.markdown(f"- **{header}**")
-                for b in j.get('responsibilities', []) or []:
-                    st.markdown(f"  - {b}")
+                lines.append(f"- **{header}**")
+                lines.extend(f"  - {b}" for b in j.get('responsibilities', []) or [])
+            st.markdown("\n".join(lines))
 
         show_section("Experience", lambda: _render_jobs(orig), 'experience')
 
@@ -710,14 +1055,16 @@ elif page == "Comparison":
             if not items:
                 st.write("—")
                 return
+            lines = []
             for p in items:
                 name = p.get('name','Project')
                 tech = p.get('technologies','')
                 desc = p.get('description','')
                 line = f"**{name}**"
                 if tech: line += f" ({tech})"
-                st.markdown(f"- {line}")
-                if desc: st.markdown(f"  - {desc}")
+                lines.append(f"- {line}")
+                if desc: lines.append(f"  - {desc}")
+            st.markdown("\n".join(lines))
 
         show_section("Projects", lambda: _render_projects(orig), 'projects')
         
@@ -742,8 +1089,10 @@ elif page == "Comparison":
             st.subheader(f"🔍 AI Recommendations  ·  source: {provider}")
             st.markdown(f"**Summary:** {recs.get('summary','')}")
             with st.expander("Show detailed suggestions", expanded=True):
-                for r in recs.get("recommendations", []):
-                    st.markdown(f"- **{r.get('title','')}** — {r.get('detail','')} _(impact: {r.get('impact_estimate','')}, category: {r.get('category','n/a')})_")
+                st.markdown("\n".join(
+                    f"- **{r.get('title','')}** — {r.get('detail','')} _(impact: {r.get('impact_estimate','')}, category: {r.get('category','n/a')})_"
+                    for r in recs.get("recommendations", [])
+                ))
             if recs.get("keywords_to_add"):
                 st.markdown("**Keywords to consider adding:**")
                 st.write(", ".join(recs["keywords_to_add"]))
@@ -756,36 +1105,16 @@ elif page == "Comparison":
 elif page == "Feedback Chatbot":
     st.title("💬 Feedback Chatbot")
     st.caption("Ask questions about your resume, ATS score, or how to improve specific sections. You can also drop a file for context.")
-    # If flagged, clear input before widget is created
-    if st.session_state.get("reset_chat_input"):
-        st.session_state.chat_input = ""
-        st.session_state.reset_chat_input = False
 
-    # Quick chips
     def _set_chat_input_val(v: str):
         st.session_state.chat_input = v
-    chips = [
-        "How can I improve my professional summary?",
-        "Which keywords am I missing for a Data Scientist role?",
-        "Rewrite my last job bullets to be more impact-driven.",
-        "Suggest better formatting for ATS.",
-    ]
-    cc1, cc2, cc3, cc4 = st.columns(4)
-    for i, (col, txt) in enumerate(zip([cc1, cc2, cc3, cc4], chips)):
-        with col:
-            st.button(txt, key=f"chip_{i}", on_click=_set_chat_input_val, args=(txt,))
 
     # File upload
     up = st.file_uploader("Attach resume (optional)", type=["pdf", "docx"], accept_multiple_files=False)
     attached_text = ""
     if up:
         try:
-            if up.name.lower().endswith(".pdf"):
-                from utils.parser import extract_text_from_pdf
-                attached_text = extract_text_from_pdf(up)
-            else:
-                from utils.parser import extract_text_from_docx
-                attached_text = extract_text_from_docx(up)
+            attached_text = _extract_cached(up.name, up.getvalue())
             st.success("File content loaded for context")
         except Exception as e:
             st.warning(f"Could not read file: {e}")
@@ -793,69 +1122,105 @@ elif page == "Feedback Chatbot":
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
 
-    # Input
-    user_msg_widget = st.text_area("Your message", key="chat_input", height=100, placeholder="Type your question or paste a section of your resume...")
+    # Input + history live in a fragment so a Send only reruns this subtree,
+    # not the whole page, and history deltas stop replaying on unrelated
+    # widget interactions.
+    @st.fragment
+    def chat_ui(attached_text: str):
+        # If flagged, clear input before widget is created
+        if st.session_state.get("reset_chat_input"):
+            st.session_state.chat_input = ""
+            st.session_state.reset_chat_input = False
 
-    if st.button("Send", type="primary"):
-        user_msg = (st.session_state.get("chat_input", "") or "").strip()
-        if user_msg or attached_text:
-            st.session_state.chat_history.append({"role": "user", "content": user_msg})
+        # Quick chips live in the same fragment as the input widget: the
+        # on_click only reruns the enclosing fragment, so the injected
+        # prompt must be consumed here to show up without a full-app rerun
+        cols = st.columns(len(CHIPS))
+        for i, (col, txt) in enumerate(zip(cols, CHIPS)):
+            with col:
+                st.button(txt, key=f"chip_{i}", on_click=_set_chat_input_val, args=(txt,))
 
-        # Compose context
-        ctx = []
-        if st.session_state.get("enhanced_content"):
-            ctx.append("Enhanced resume JSON:\n" + str(st.session_state.enhanced_content))
-        elif st.session_state.get("resume_data"):
-            ctx.append("Resume JSON:\n" + str(st.session_state.resume_data))
-        if attached_text:
-            ctx.append("Attached file text:\n" + attached_text[:6000])
-        ctx_text = "\n\n".join(ctx)
-
-        answer = None
-        if os.getenv("OPENAI_API_KEY") and OpenAI is not None:
-            try:
-                client = OpenAI()
-                system = "You are a helpful, precise resume coach. Give concise, actionable feedback with examples when useful."
-                prompt = f"Context (may be partial):\n{ctx_text}\n\nUser: {user_msg}"
+        user_msg_widget = st.text_area("Your message", key="chat_input", height=100, placeholder="Type your question or paste a section of your resume...")
+
+        if st.button("Send", type="primary"):
+            user_msg = (st.session_state.get("chat_input", "") or "").strip()
+            if user_msg or attached_text:
+                st.session_state.chat_history.append({"role": "user", "content": user_msg})
+
+            # Compose context
+            # Real JSON (not repr()) — faster to serialize and valid for the LLM
+            ctx = []
+            if st.session_state.get("enhanced_content"):
+                ctx.append("Enhanced resume JSON:\n" + _prompt_json(st.session_state.enhanced_content))
+            elif st.session_state.get("resume_data"):
+                ctx.append("Resume JSON:\n" + _prompt_json(st.session_state.resume_data))
+            if attached_text:
+                ctx.append("Attached file text:\n" + attached_text)
+            ctx_text = ("\n\n".join(ctx))[:MAX_CHAT_CTX]
+
+            answer = None
+            OpenAI = _openai_sdk().OpenAI
+            if os.getenv("OPENAI_API_KEY") and OpenAI is not None:
                 try:
-                    r = client.responses.create(
-                        model=os.getenv("OPENAI_MODEL") or "gpt-4o-mini",
-                        input=[
-                            {"role": "system", "content": system},
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=0.3,
-                        max_output_tokens=600,
-                    )
-                    answer = getattr(r, "output_text", None)
-                except Exception:
-                    # Fallback to chat.completions
-                    cr = client.chat.completions.create(
-                        model=os.getenv("OPENAI_MODEL") or "gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": system},
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=0.3,
-                        max_tokens=600,
-                    )
-                    answer = (cr.choices[0].message.content or "").strip()
-            except Exception as e:
-                answer = f"OpenAI error: {e}"
-        else:
-            answer = "OpenAI API key not detected. Please set OPENAI_API_KEY to use the chatbot."
+                    # Session-scoped singleton: survives reruns like
+                    # cache_resource but stays isolated per user session, which
+                    # matters if the API key ever becomes user-provided.
+                    # Explicit guard — setdefault would construct (and throw
+                    # away) a fresh client on every Send.
+                    if "openai_client" not in st.session_state:
+                        st.session_state.openai_client = OpenAI()
+                    client = st.session_state.openai_client
+                    system = "You are a helpful, precise resume coach. Give concise, actionable feedback with examples when useful."
+                    prompt = f"Context (may be partial):\n{ctx_text}\n\nUser: {user_msg}"
+                    messages = [
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ]
+                    try:
+                        # Stream tokens into a placeholder so the user sees
+                        # output at first-token latency instead of waiting
+                        # for the full completion.
+                        placeholder = st.empty()
+                        buf = []
+                        for chunk in client.chat.completions.create(
+                            model=OPENAI_MODEL,
+                            messages=messages,
+                            temperature=0.3,
+                            max_tokens=600,
+                            stream=True,
+                        ):
+                            tok = chunk.choices[0].delta.content or ""
+                            if tok:
+                                buf.append(tok)
+                                placeholder.markdown("**Assistant:** " + "".join(buf))
+                        answer = "".join(buf).strip()
+                        # History below renders the final answer; drop the
+                        # interim placeholder so it isn't shown twice.
+                        placeholder.empty()
+                    except Exception:
+                        # Fallback to a blocking completion
+                        cr = client.chat.completions.create(
+                            model=OPENAI_MODEL,
+                            messages=messages,
+                            temperature=0.3,
+                            max_tokens=600,
+                        )
+                        answer = (cr.choices[0].message.content or "").strip()
+                except Exception as e:
+                    answer = f"OpenAI error: {e}"
+            else:
+                answer = "OpenAI API key not detected. Please set OPENAI_API_KEY to use the chatbot."
 
-        st.session_state.chat_history.append({"role": "assistant", "content": answer or ""})
-        # Clear input on next run to avoid Streamlit widget-state mutation error
-        st.session_state.reset_chat_input = True
-        st.rerun()
+            st.session_state.chat_history.append({"role": "assistant", "content": answer or ""})
+            # Clear input on next run to avoid Streamlit widget-state mutation error
+            st.session_state.reset_chat_input = True
 
-    # Render chat history
-    for m in st.session_state.chat_history[-12:]:
-        if m["role"] == "user":
-            st.markdown(f"**You:** {m['content']}")
-        else:
-            st.markdown(f"**Assistant:** {m['content']}")
+        # Render chat history
+        for m in st.session_state.chat_history[-12:]:
+            with st.chat_message("user" if m["role"] == "user" else "assistant"):
+                st.markdown(m["content"])
+
+    chat_ui(attached_text)
 
 # Score Tracker
 elif page == "Score Tracker":
@@ -864,59 +1229,8 @@ elif page == "Score Tracker":
     # Explain how scoring is computed
     st.markdown("### How scoring works")
     with st.expander("View scoring rubric", expanded=False):
-        st.markdown(
-            """
-            - **Overall score** = 30% Completeness + 40% Keyword Relevance + 30% Formatting/Readability.
-            - **Completeness (30 pts)**
-              - Has contact details with email and either phone or a link (LinkedIn/GitHub) (up to 8 pts)
-              - Professional summary present (6 pts)
-              - Sufficient skills listed (target ≥ 8) (6 pts)
-              - Education section present (5 pts)
-              - Experience section present (5 pts)
-            - **Keyword Relevance (40 pts)**
-              - Skills richness: more distinct, relevant skills → up to 20 pts
-              - Reuse of those skills/keywords in summary and bullets → up to 15 pts
-              - Role/title signals (e.g., Engineer, Senior) → up to 5 pts
-            - **Formatting/Readability (30 pts)**
-              - Adequate number of strong bullet points in experience → up to 8 pts
-              - Use of action verbs (Led, Built, Optimized, Delivered, etc.) → up to 8 pts
-              - Quantified impact (numbers, %, x) → up to 7 pts
-              - Consistent dates across roles → up to 5 pts
-              - Links present (LinkedIn/GitHub) → up to 2 pts
-            """
-        )
-    hist = st.session_state.get("score_history", [])
-    if not hist:
-        st.info("No scores yet. Compute a baseline or run an enhancement.")
-    else:
-        labels = [h.get("label","step") for h in hist]
-        overall = [h.get("overall",0) for h in hist]
-        keywords = [h.get("keywords",0) for h in hist]
-        fmt = [h.get("format",0) for h in hist]
-        st.bar_chart({"Overall": overall, "Keywords": keywords, "Format": fmt})
-        st.markdown("### History")
-        for i, h in enumerate(hist, 1):
-            st.write(f"{i}. {h.get('label','step')} — Overall {h.get('overall')} | Keywords {h.get('keywords')} | Format {h.get('format')}")
-            with st.expander("Show breakdown", expanded=False):
-                bd = h.get('breakdown') or {}
-                if not bd:
-                    # Try to compute a representative breakdown for this step
-                    data_src = None
-                    if (h.get('label') == 'baseline') and st.session_state.get('resume_data'):
-                        data_src = st.session_state.resume_data
-                    elif (h.get('label') == 'enhanced') and st.session_state.get('enhanced_content'):
-                        data_src = st.session_state.enhanced_content
-                    if data_src:
-                        try:
-                            from utils.ats_scorer import calculate_ats_score
-                            tmp = calculate_ats_score(data_src)
-                            bd = tmp.get('breakdown', {}) or {}
-                        except Exception as _:
-                            bd = {}
-                if bd:
-                    st.json(bd)
-                else:
-                    st.caption("No breakdown available for this historical entry.")
+        st.markdown(_RUBRIC_MD)
+    _render_score_tracker_history()
 
 # Footer
 st.sidebar.markdown("---")
@@ -1,9 +1,9 @@
 # Utils package initializer
 from .parser import parse_resume, extract_text_from_pdf, extract_text_from_docx
 from .ats_scorer import calculate_ats_score
-from .ai_enhancer import enhance_resume_content
+from .ai_enhancer import enhance_resume_content, enhance_resume_content_stream
 from .template_manager import get_available_templates, apply_template
-from .file_generator import generate_docx, generate_pdf
+from .file_generator import generate_docx, generate_pdf, generate_docx_bytes, generate_pdf_bytes
 
 __all__ = [
     'parse_resume',
@@ -11,8 +11,11 @@ __all__ = [
     'extract_text_from_docx',
     'calculate_ats_score',
     'enhance_resume_content',
+    'enhance_resume_content_stream',
     'get_available_templates',
     'apply_template',
     'generate_docx',
-    'generate_pdf'
+    'generate_pdf',
+    'generate_docx_bytes',
+    'generate_pdf_bytes'
 ]
\ No newline at end of file
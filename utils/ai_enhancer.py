@@ -1,8 +1,26 @@
+import heapq
+import importlib.util
 import os
 from typing import Dict, List
 import re
 from datetime import datetime
 
+# Availability checked once at import — find_spec is a metadata lookup and
+# avoids paying the SDK import cost on every enhancement call.
+_OPENAI_OK = importlib.util.find_spec("openai") is not None
+try:
+    _GEMINI_OK = importlib.util.find_spec("google.generativeai") is not None
+except Exception:
+    _GEMINI_OK = False
+
+# Precompiled patterns — these run per-job/per-bullet, so hoisting them out
+# of the loops avoids repeated re-cache lookups.
+_DATE_RANGE_RE = re.compile(r"([A-Za-z]{3,9}\s+\d{4}|\d{4})\s*[–-]\s*(Present|[A-Za-z]{3,9}\s+\d{4}|\d{4})")
+_PRESENT_RE = re.compile(r"present", re.IGNORECASE)
+_QUANT_RE = re.compile(r"\b(\d+|%|x)\b", re.IGNORECASE)
+
+_VERB_RE = re.compile(r"^(led|optimized|implemented|automated|delivered|improved)\b", re.IGNORECASE)
+
 
 def enhance_resume_content(data: Dict, target_role: str = "", enhancement_level: str = "moderate") -> tuple[Dict, list]:
     """Enhance resume content using simple local heuristics with optional API fallbacks.
@@ -10,15 +28,33 @@ def enhance_resume_content(data: Dict, target_role: str = "", enhancement_level:
     Returns: (enhanced_data, modifications_list)
     enhancement_level: one of ['conservative','moderate','aggressive']
     """
+    enhanced, modifications = {}, []
+    for enhanced, modifications in enhance_resume_content_stream(data, target_role, enhancement_level):
+        pass
+    return enhanced, modifications
+
+
+def enhance_resume_content_stream(data: Dict, target_role: str = "", enhancement_level: str = "moderate"):
+    """Generator variant of enhance_resume_content for progressive UI rendering.
+
+    Yields (partial_data, modifications) after each enhancement stage so the
+    caller can show intermediate results instead of blocking on the full run;
+    the final yield carries the complete result.
+    """
     original = data or {}
     enhanced = dict(original) if isinstance(original, dict) else {}
     enhanced.setdefault("personal_info", {})
+    # Track whether each stage actually changed anything so the no-op path
+    # (common for already-polished resumes) can skip the diff entirely
+    _changed = {"summary": False, "skills": False, "exp": False}
 
-    summary = enhanced.get("personal_info", {}).get("summary", "")
-    if not summary:
-        summary = generate_resume_summary(enhanced, target_role)
+    old_summary = enhanced.get("personal_info", {}).get("summary", "")
+    summary = old_summary or generate_resume_summary(enhanced, target_role)
     # Only lightly touch a non-empty, data-driven summary
-    enhanced["personal_info"]["summary"] = enhance_summary(summary, target_role, enhancement_level)
+    new_summary = enhance_summary(summary, target_role, enhancement_level)
+    enhanced["personal_info"]["summary"] = new_summary
+    _changed["summary"] = new_summary != old_summary
+    yield enhanced, []
 
     # Enhance experience bullets
     exp_list = enhanced.get("experience", []) or []
@@ -26,27 +62,36 @@ def enhance_resume_content(data: Dict, target_role: str = "", enhancement_level:
     for job in exp_list:
         bullets = job.get("responsibilities", []) or []
         improved_bullets = [enhance_experience_bullet(b, target_role) for b in bullets]
+        if improved_bullets != bullets:
+            _changed["exp"] = True
         j2 = dict(job)
         j2["responsibilities"] = improved_bullets
         improved_exp.append(j2)
     enhanced["experience"] = improved_exp
+    yield enhanced, []
 
     # Enhance skills ordering/deduping
-    enhanced["skills"] = enhance_skills(enhanced.get("skills", []), target_role)
+    old_skills = enhanced.get("skills", []) or []
+    enhanced["skills"] = enhance_skills(old_skills, target_role)
+    _changed["skills"] = enhanced["skills"] != old_skills
 
     # Attempt API-based enhancement if keys exist (best-effort, safe fallback)
+    pre_hook = enhanced
     try:
         context = {"target_role": target_role, "level": enhancement_level}
-        if os.getenv("OPENAI_API_KEY"):
+        if os.getenv("OPENAI_API_KEY") and _OPENAI_OK:
             enhanced = enhance_with_openai(enhanced, context)
-        elif os.getenv("GEMINI_API_KEY"):
+        elif os.getenv("GEMINI_API_KEY") and _GEMINI_OK:
             enhanced = enhance_with_gemini(enhanced, context)
     except Exception:
         # Silently fallback to local enhancements
         pass
 
-    modifications = _diff_resume(original, enhanced)
-    return enhanced, modifications
+    if any(_changed.values()) or enhanced is not pre_hook:
+        modifications = _diff_resume(original, enhanced)
+    else:
+        modifications = []
+    yield enhanced, modifications
 
 
 def enhance_with_openai(content: Dict, context: Dict) -> Dict:
@@ -92,8 +137,7 @@ def enhance_experience_bullet(bullet: str, role: str = "") -> str:
     if not bullet:
         return bullet
     bullet = bullet.strip().lstrip("-•* ")
-    verbs = ["Led", "Optimized", "Implemented", "Automated", "Delivered", "Improved"]
-    has_verb = any(bullet.lower().startswith(v.lower()) for v in verbs)
+    has_verb = bool(_VERB_RE.match(bullet))
     if not has_verb:
         bullet = f"Implemented {bullet[0].lower() + bullet[1:]}"
     if role and role.lower() not in bullet.lower():
@@ -101,37 +145,30 @@ def enhance_experience_bullet(bullet: str, role: str = "") -> str:
     return bullet
 
 
+def _dedup_preserve(items: List[str]) -> List[str]:
+    """Case-insensitive dedup that keeps first-seen order and casing."""
+    seen = set()
+    out = []
+    for s in items:
+        k = (s or "").strip()
+        if k and k.lower() not in seen:
+            seen.add(k.lower())
+            out.append(k)
+    return out
+
+
 def enhance_skills(skills: List[str], role: str = "") -> List[str]:
     if not skills:
         return []
     # Deduplicate, case-insensitive, prioritize role-relevant skills first
-    seen = set()
-    unique = []
-    for s in skills:
-        key = (s or "").strip()
-        if not key:
-            continue
-        low = key.lower()
-        if low not in seen:
-            seen.add(low)
-            unique.append(key)
+    unique = _dedup_preserve(skills)
     if role:
-        role_low = role.lower()
-        unique.sort(key=lambda x: 0 if role_low in x.lower() else 1)
+        role_tokens = frozenset(role.lower().split())
+        unique.sort(key=lambda x: 0 if not role_tokens.isdisjoint(x.lower().split()) else 1)
     return unique[:25]
 
 
 def generate_resume_summary(data: Dict, role: str = "") -> str:
-    # Infer role from target_role or experience titles
-    inferred_role = (role or "").strip()
-    titles: List[str] = [str((j or {}).get("title", "")) for j in (data.get("experience", []) or [])]
-    if not inferred_role and titles:
-        # Pick the longest recent-looking title
-        inferred_role = sorted(titles, key=lambda t: (len(t), t.lower()), reverse=True)[0] or "Professional"
-    if not inferred_role:
-        inferred_role = "Professional"
-
-    # Estimate years from dates in experience
     def _parse_date_token(tok: str) -> datetime | None:
         tok = tok.strip()
         for fmt in ["%b %Y", "%B %Y", "%Y"]:
@@ -141,33 +178,45 @@ def generate_resume_summary(data: Dict, role: str = "") -> str:
                 continue
         return None
 
+    # Single pass over experience: titles, total months and quantified
+    # achievements used to be collected in three separate loops.
+    titles: List[str] = []
     total_months = 0
+    achievements: List[str] = []
     for j in (data.get("experience", []) or []):
+        j = j or {}
+        titles.append(str(j.get("title", "")))
         dates = str(j.get("dates", ""))
         # Common patterns: "Jan 2020 - Present", "2019 - 2022", "2021–Present"
-        m = re.findall(r"([A-Za-z]{3,9}\s+\d{4}|\d{4})\s*[–-]\s*(Present|[A-Za-z]{3,9}\s+\d{4}|\d{4})", dates)
-        if not m:
-            continue
-        start_s, end_s = m[0]
-        start_dt = _parse_date_token(start_s) or None
-        end_dt = datetime.now() if re.match(r"(?i)present", end_s) else (_parse_date_token(end_s) or None)
-        if start_dt and end_dt and end_dt >= start_dt:
-            diff = (end_dt.year - start_dt.year) * 12 + (end_dt.month - start_dt.month)
-            total_months += max(0, diff)
+        m = _DATE_RANGE_RE.findall(dates)
+        if m:
+            start_s, end_s = m[0]
+            start_dt = _parse_date_token(start_s) or None
+            end_dt = datetime.now() if _PRESENT_RE.match(end_s) else (_parse_date_token(end_s) or None)
+            if start_dt and end_dt and end_dt >= start_dt:
+                diff = (end_dt.year - start_dt.year) * 12 + (end_dt.month - start_dt.month)
+                total_months += max(0, diff)
+        if len(achievements) < 2:
+            for b in (j.get("responsibilities", []) or []):
+                text = str(b).strip()
+                if _QUANT_RE.search(text):
+                    # Normalize sentence casing
+                    achievements.append(text.rstrip(". "))
+                if len(achievements) >= 2:
+                    break
     years = max(0, round(total_months / 12))
 
+    # Infer role from target_role or experience titles
+    inferred_role = (role or "").strip()
+    if not inferred_role and titles:
+        # Pick the longest recent-looking title
+        inferred_role = sorted(titles, key=lambda t: (len(t), t.lower()), reverse=True)[0] or "Professional"
+    if not inferred_role:
+        inferred_role = "Professional"
+
     # Pick top skills (dedup, prioritize ones that match role)
     raw_skills = (data.get("skills") or []) if isinstance(data.get("skills"), list) else []
-    seen = set()
-    skills: List[str] = []
-    for s in raw_skills:
-        k = (s or "").strip()
-        if not k:
-            continue
-        low = k.lower()
-        if low not in seen:
-            seen.add(low)
-            skills.append(k)
+    skills = _dedup_preserve(raw_skills)
     role_low = inferred_role.lower()
     skills.sort(key=lambda x: 0 if role_low and role_low.split()[0] in x.lower() else 1)
     top = skills[:8]
@@ -182,19 +231,6 @@ def generate_resume_summary(data: Dict, role: str = "") -> str:
     else:
         skills_sentence = "Expertise across relevant tools and methods."
 
-    # Extract up to two quantified achievements from bullets
-    achievements: List[str] = []
-    for j in (data.get("experience", []) or []):
-        for b in (j.get("responsibilities", []) or []):
-            text = str(b).strip()
-            if re.search(r"\b(\d+|%|x)\b", text, re.IGNORECASE):
-                # Normalize sentence casing
-                achievements.append(text.rstrip(". "))
-            if len(achievements) >= 2:
-                break
-        if len(achievements) >= 2:
-            break
-
     ach_sentence = ""
     if achievements:
         if len(achievements) == 1:
@@ -211,30 +247,39 @@ def generate_resume_summary(data: Dict, role: str = "") -> str:
 
 def _diff_resume(before: Dict, after: Dict) -> list:
     """Produce a simple list of modifications between two resume dicts."""
+    if before is after:
+        return []
     changes = []
     bpi = (before or {}).get("personal_info", {})
     api = (after or {}).get("personal_info", {})
     if bpi.get("summary") != api.get("summary"):
         changes.append("Updated professional summary")
 
-    # Skills changes
-    bskills = set((before or {}).get("skills", []) or [])
-    askills = set((after or {}).get("skills", []) or [])
-    added = list(askills - bskills)
-    removed = list(bskills - askills)
-    if added:
-        changes.append(f"Added skills: {', '.join(sorted(added)[:10])}")
-    if removed:
-        changes.append(f"Removed duplicate/irrelevant skills: {', '.join(sorted(removed)[:10])}")
+    # Skills changes — element-wise list equality is a C-level check, so
+    # skip the diff construction in the common unchanged case. dict.fromkeys
+    # keeps original order/casing; nsmallest bounds the sort to the 10 shown.
+    bskills_list = (before or {}).get("skills", []) or []
+    askills_list = (after or {}).get("skills", []) or []
+    if bskills_list != askills_list:
+        bset = dict.fromkeys(bskills_list)
+        aset = dict.fromkeys(askills_list)
+        added = [s for s in aset if s not in bset]
+        removed = [s for s in bset if s not in aset]
+        if added:
+            changes.append(f"Added skills: {', '.join(heapq.nsmallest(10, added))}")
+        if removed:
+            changes.append(f"Removed duplicate/irrelevant skills: {', '.join(heapq.nsmallest(10, removed))}")
 
     # Experience bullets improved
     bexp = (before or {}).get("experience", []) or []
     aexp = (after or {}).get("experience", []) or []
-    if aexp and bexp:
+    if aexp and bexp and bexp is not aexp:
         improved = 0
         for i in range(min(len(bexp), len(aexp))):
             bb = bexp[i].get("responsibilities", []) or []
             ab = aexp[i].get("responsibilities", []) or []
+            if bb is ab:
+                continue
             improved += sum(1 for j in range(min(len(bb), len(ab))) if bb[j] != ab[j])
         if improved:
             changes.append(f"Improved {improved} experience bullet(s)")
@@ -1,8 +1,204 @@
-from typing import Dict, List
+from typing import Dict, List, NamedTuple
+import copy
+import hashlib
+import itertools
+import json
 import os
 import re
 import requests
 
+# Patterns compiled once — scoring is called per rerun and per history entry,
+# and the per-verb comprehension alone used to compile ~18 patterns per call.
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+_PHONE_RE = re.compile(r"\d{10}")
+_DATE_RE = re.compile(r"(\b\d{4}\b|\b[A-Za-z]{3,9}\s*\d{4}\b)")
+
+_ACTION_VERBS = (
+    "led", "built", "developed", "designed", "implemented", "owned", "improved", "reduced", "increased",
+    "optimized", "launched", "created", "automated", "migrated", "analyzed", "architected", "delivered", "managed",
+)
+# Fused scans: one traversal tallied by lastgroup instead of one pass per
+# pattern family (verbs, numbers, %, x-multipliers; role vs seniority).
+_FUSED_RE = re.compile(
+    r"(?P<verb>\b(?:%s)\b)|(?P<num>\b\d+\b)|(?P<pct>%%)|(?P<xmult>x\b)" % "|".join(_ACTION_VERBS)
+)
+_TITLE_SIGNAL_RE = re.compile(
+    r"(?P<role>\b(?:engineer|developer|analyst|scientist|manager|intern)\b)"
+    r"|(?P<seniority>\b(?:senior|lead|principal)\b)"
+)
+
+# Optional Aho-Corasick matcher: finds every verb and skill in one pass over
+# the combined text instead of one scan per pattern.
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None  # type: ignore
+
+if ahocorasick is not None:
+    _VERB_AUTOMATON = ahocorasick.Automaton()
+    for _v in _ACTION_VERBS:
+        _VERB_AUTOMATON.add_word(_v, _v)
+    _VERB_AUTOMATON.make_automaton()
+else:
+    _VERB_AUTOMATON = None
+
+# Optional Hyperscan tier: compiles all verb + quant patterns into one
+# SIMD-accelerated database matched in a single linear pass. Preferred over
+# the Aho-Corasick/regex paths when the binding is installed.
+try:
+    import hyperscan  # type: ignore
+except Exception:
+    hyperscan = None  # type: ignore
+
+if hyperscan is not None:
+    _HS_QUANT_BASE = len(_ACTION_VERBS)
+    _hs_exprs = [rb"\b" + _v.encode() + rb"\b" for _v in _ACTION_VERBS]
+    _hs_exprs += [rb"\b\d+\b", rb"%", rb"x\b"]
+    try:
+        _HS_DB = hyperscan.Database()
+        _HS_DB.compile(
+            expressions=_hs_exprs,
+            ids=list(range(len(_hs_exprs))),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(_hs_exprs),
+        )
+    except Exception:
+        _HS_DB = None
+else:
+    _HS_DB = None
+
+
+def _is_word_hit(text: str, start: int, end: int) -> bool:
+    """Word-boundary check for an automaton hit spanning text[start:end+1]."""
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end + 1 < len(text) and text[end + 1].isalnum():
+        return False
+    return True
+
+
+_DIGIT_RUN_RE = re.compile(r"\d+")
+_XMULT_RE = re.compile(r"x\b")
+
+
+def _count_quant_tokens(text: str) -> int:
+    """Count quant tokens (standalone numbers, %, x-multipliers) cheaply.
+
+    str.count handles the '%' literal without a match-object allocation;
+    digit runs are found once and boundary-checked against neighbours to
+    keep the old \\b\\d+\\b semantics.
+    """
+    hits = text.count("%") + len(_XMULT_RE.findall(text))
+    for m in _DIGIT_RUN_RE.finditer(text):
+        if _is_word_hit(text, m.start(), m.end() - 1):
+            hits += 1
+    return hits
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+def _skill_hits(combined_text: str, uniq_skills: set) -> int:
+    """Count distinct skills present in the text.
+
+    Single-token skills (the common case) are matched by intersecting one
+    tokenization of the text — O(|skills|) hash probes instead of one
+    substring search per skill. Multi-word skills keep substring semantics.
+    """
+    wanted = {s for s in uniq_skills if s}
+    if not wanted:
+        return 0
+    single = {s for s in wanted if " " not in s}
+    hits = 0
+    if single:
+        tokens = set(_TOKEN_RE.findall(combined_text))
+        # The token class keeps '.' so 'node.js' stays whole, but that also
+        # glues sentence-final periods on ('sql.'); count stripped variants
+        # too so skills ending a sentence still hit
+        tokens |= {t.rstrip(".") for t in tokens}
+        hits += len(single & tokens)
+    multi = wanted - single
+    if multi:
+        if ahocorasick is not None:
+            # Rebuilding the automaton per call is cheap next to scanning
+            # the text once per skill.
+            auto = ahocorasick.Automaton()
+            for s in multi:
+                auto.add_word(s, s)
+            auto.make_automaton()
+            skills_seen = set()
+            for _end, s in auto.iter(combined_text):
+                skills_seen.add(s)
+                if len(skills_seen) == len(multi):
+                    break
+            hits += len(skills_seen)
+        else:
+            hits += sum(1 for s in multi if s in combined_text)
+    return hits
+
+
+def _scan_combined(combined_text: str, uniq_skills: set) -> tuple:
+    """Count distinct action verbs, reused skills and quant tokens.
+
+    Tiered: Hyperscan when installed (all verb/quant patterns in one SIMD
+    pass), then Aho-Corasick, then a single fused finditer pass tallied by
+    lastgroup. Returns (verb_hits, reuse_hits, quant_hits).
+    """
+    if _HS_DB is not None:
+        verbs_seen = set()
+        quant = [0]
+
+        def _on_match(id_, start, end, flags, context=None):
+            if id_ < _HS_QUANT_BASE:
+                verbs_seen.add(id_)
+            else:
+                quant[0] += 1
+            return 0
+
+        _HS_DB.scan(combined_text.encode(), match_event_handler=_on_match)
+        return len(verbs_seen), _skill_hits(combined_text, uniq_skills), quant[0]
+
+    if _VERB_AUTOMATON is not None:
+        verbs_seen = set()
+        for end, v in _VERB_AUTOMATON.iter(combined_text):
+            if _is_word_hit(combined_text, end - len(v) + 1, end):
+                verbs_seen.add(v)
+        quant_hits = _count_quant_tokens(combined_text)
+        return len(verbs_seen), _skill_hits(combined_text, uniq_skills), quant_hits
+
+    verbs_seen = set()
+    quant_hits = 0
+    for m in _FUSED_RE.finditer(combined_text):
+        if m.lastgroup == "verb":
+            verbs_seen.add(m.group())
+        else:
+            quant_hits += 1
+    return len(verbs_seen), _skill_hits(combined_text, uniq_skills), quant_hits
+
+
+def _title_signals(title_text: str) -> tuple:
+    """Single fused pass over the joined titles; returns (role, seniority)."""
+    has_role = has_seniority = False
+    for m in _TITLE_SIGNAL_RE.finditer(title_text):
+        if m.lastgroup == "role":
+            has_role = True
+        else:
+            has_seniority = True
+        if has_role and has_seniority:
+            break
+    return has_role, has_seniority
+
+
+def _canonical_key(d: Dict) -> bytes:
+    """Stable 16-byte digest of a JSON-serializable dict."""
+    blob = json.dumps(d or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(blob.encode(), digest_size=16).digest()
+
+
+# Manual bounded cache keyed on the content digest: scoring is pure in its
+# input, and the same resume is re-scored on every template toggle/rerun.
+_SCORE_CACHE: Dict[bytes, Dict] = {}
+_SCORE_CACHE_MAX = 128
+
 
 def calculate_ats_score(resume_data: Dict) -> Dict:
     url = os.getenv("ATS_API_URL", "").strip()
@@ -29,7 +225,81 @@ def calculate_ats_score_api(resume_data: Dict, url: str, api_key: str) -> Dict:
     }
     return out
 
+class NormalizedResume(NamedTuple):
+    """Flat, str-coerced view of a resume for the scoring loops.
+
+    Parallel lists instead of dicts-of-dicts: the scorer only needs text
+    fields, and tight loops over flat lists skip the per-item dict lookups
+    and default-value allocations.
+    """
+    summary: str
+    titles: List[str]
+    companies: List[str]
+    dates: List[str]
+    bullets: List[List[str]]
+    project_blobs: List[str]
+
+
+def _normalize_resume(resume_data: Dict) -> NormalizedResume:
+    """One traversal of the nested resume dict into a NormalizedResume."""
+    personal = resume_data.get("personal_info", {}) or {}
+    titles, companies, dates, bullets = [], [], [], []
+    for j in (resume_data.get("experience", []) or []):
+        j = j or {}
+        titles.append(str(j.get("title", "")))
+        companies.append(str(j.get("company", "")))
+        dates.append(str(j.get("dates", "")))
+        bullets.append([str(b) for b in (j.get("responsibilities", []) or [])])
+    project_blobs = [
+        " ".join([str(p.get("name", "")), str(p.get("description", "")), str(p.get("technologies", ""))])
+        for p in (resume_data.get("projects", []) or [])
+    ]
+    return NormalizedResume(
+        summary=str(personal.get("summary") or ""),
+        titles=titles,
+        companies=companies,
+        dates=dates,
+        bullets=bullets,
+        project_blobs=project_blobs,
+    )
+
+
+def _iter_text(norm: NormalizedResume):
+    """Yield every text fragment of the normalized resume, lazily.
+
+    Feeding the generator straight into one join keeps the whole combined
+    text down to a single allocated buffer (plus its lowered copy).
+    """
+    if norm.summary:
+        yield norm.summary
+    yield from norm.titles
+    yield from norm.companies
+    yield from norm.dates
+    for bl in norm.bullets:
+        yield from bl
+    yield from norm.project_blobs
+
+
 def calculate_ats_score_local(resume_data: Dict) -> Dict:
+    """Memoized wrapper around the rubric scorer.
+
+    Scoring is a pure function of the resume dict, so results are cached by
+    a digest of its canonical JSON; a deep copy is returned so callers can
+    mutate results without poisoning the cache.
+    """
+    try:
+        key = _canonical_key(resume_data)
+    except Exception:
+        return _calculate_ats_score_local_uncached(resume_data)
+    cached = _SCORE_CACHE.get(key)
+    if cached is None:
+        if len(_SCORE_CACHE) >= _SCORE_CACHE_MAX:
+            _SCORE_CACHE.clear()
+        cached = _SCORE_CACHE[key] = _calculate_ats_score_local_uncached(resume_data)
+    return copy.deepcopy(cached)
+
+
+def _calculate_ats_score_local_uncached(resume_data: Dict) -> Dict:
     """Deterministic rubric-based ATS scoring (no randomness).
     Breakdown:
     - Completeness (30): contact, summary, skills, education, experience, projects
@@ -42,23 +312,20 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
     experience = resume_data.get("experience", []) or []
     projects = resume_data.get("projects", []) or []
 
-    text_blobs: List[str] = []
-    if personal.get("summary"): text_blobs.append(str(personal["summary"]))
-    for j in experience:
-        text_blobs.append(" ".join([str(j.get("title","")), str(j.get("company","")), str(j.get("dates",""))]))
-        text_blobs.extend([str(b) for b in (j.get("responsibilities", []) or [])])
-    for p in projects:
-        text_blobs.append(" ".join([str(p.get("name","")), str(p.get("description","")), str(p.get("technologies",""))]))
-    combined_text = "\n".join(text_blobs).lower()
+    norm = _normalize_resume(resume_data)
+    # One join + one lower over the flat view — no per-job blob lists
+    combined_text = "\n".join(_iter_text(norm)).lower()
 
     # 1) Completeness (30)
     completeness = 0
     # Contact: email and at least one of phone/link
-    email_ok = bool(re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", str(personal.get("email",""))))
-    phone_ok = bool(re.search(r"\d{10}", str(personal.get("phone",""))))
+    email_ok = bool(_EMAIL_RE.search(str(personal.get("email",""))))
+    phone_ok = bool(_PHONE_RE.search(str(personal.get("phone",""))))
     link_ok = any(personal.get(k) for k in ("linkedin","github","website"))
+    summary_present = bool(personal.get("summary"))
+    links_present = bool(personal.get("linkedin") or personal.get("github"))
     if email_ok and (phone_ok or link_ok): completeness += 8
-    if personal.get("summary"): completeness += 6
+    if summary_present: completeness += 6
     if len(skills) >= 8: completeness += 6
     if education: completeness += 5
     if experience: completeness += 5
@@ -67,16 +334,20 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
     # 2) Keyword relevance (40)
     kw_score = 0
     # Skills richness up to 20
-    uniq_skills = {s.lower().strip() for s in skills}
+    # Strip before lowering (one allocation per skill) and drop empties,
+    # which otherwise inflate the richness count and match any text
+    uniq_skills = {s.strip().lower() for s in skills if s and s.strip()}
     kw_score += min(20, len(uniq_skills) * 1.25)  # 16 skills -> 20 pts
-    # Reuse of keywords in bullets and summary up to 15
-    reuse_hits = sum(1 for s in uniq_skills if s and s in combined_text)
+    # Reuse of keywords in bullets and summary up to 15 — verb and quant
+    # hits for the format section come from the same single scan
+    verb_hits, reuse_hits, quant_hits = _scan_combined(combined_text, uniq_skills)
     kw_score += min(15, reuse_hits * 0.8)
     # Role/title signals up to 5
-    title_text = " ".join([str(j.get("title","")) for j in experience]).lower()
-    if any(t in title_text for t in ["engineer","developer","analyst","scientist","manager","intern"]):
+    title_text = " ".join(norm.titles).lower()
+    has_role_signal, has_seniority_signal = _title_signals(title_text)
+    if has_role_signal:
         kw_score += 3
-    if any(t in title_text for t in ["senior","lead","principal"]):
+    if has_seniority_signal:
         kw_score += 2
 
     keyword_score = int(max(0, min(100, round((kw_score/40)*100))))
@@ -84,39 +355,29 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
     # 3) Formatting/readability (30)
     fmt = 0
     # Bullets present in experience
-    bullet_lines = 0
-    for j in experience:
-        bullet_lines += sum(1 for b in (j.get("responsibilities", []) or []) if len(str(b)) >= 20)
+    bullet_lines = sum(
+        1 for b in itertools.chain.from_iterable(norm.bullets) if len(b) >= 20
+    )
     if bullet_lines >= 5: fmt += 8
     elif bullet_lines >= 2: fmt += 5
 
-    # Action verbs
-    action_verbs = [
-        "led","built","developed","designed","implemented","owned","improved","reduced","increased",
-        "optimized","launched","created","automated","migrated","analyzed","architected","delivered","managed",
-    ]
-    verb_hits = sum(1 for v in action_verbs if re.search(rf"\b{re.escape(v)}\b", combined_text))
+    # Action verbs (distinct, counted in the scan above)
     fmt += min(8, verb_hits)
 
-    # Quantified impact (numbers, %, x)
-    quant_hits = len(re.findall(r"\b\d+\b|%|x\b", combined_text))
+    # Quantified impact (numbers, %, x — also from the fused scan)
     if quant_hits >= 6: fmt += 7
     elif quant_hits >= 3: fmt += 5
     elif quant_hits >= 1: fmt += 3
 
     # Date consistency in experience
-    date_ok = 0
-    date_re = re.compile(r"(\b\d{4}\b|\b[A-Za-z]{3,9}\s*\d{4}\b)")
-    for j in experience:
-        if date_re.search(str(j.get("dates",""))):
-            date_ok += 1
+    date_ok = sum(1 for d in norm.dates if _DATE_RE.search(d))
     if date_ok == len(experience) and len(experience) > 0:
         fmt += 5
     elif date_ok >= max(1, len(experience)//2):
         fmt += 3
 
     # Links present (LinkedIn/GitHub)
-    if personal.get("linkedin") or personal.get("github"): fmt += 2
+    if links_present: fmt += 2
 
     format_score = int(max(0, min(100, round((fmt/30)*100))))
 
@@ -126,7 +387,7 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
 
     # Suggestions
     suggestions: List[str] = []
-    if not personal.get("summary"):
+    if not summary_present:
         suggestions.append("Add a concise professional summary with role-relevant keywords.")
     if len(skills) < 10:
         suggestions.append("Add more role-relevant skills (target 10–20 distinct skills).")
@@ -141,7 +402,7 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
             suggestions.append("Quantify impact with numbers, % or multipliers where possible.")
         if date_ok < len(experience):
             suggestions.append("Normalize date formats across roles (e.g., Jan 2023 – Present).")
-    if not (personal.get("linkedin") or personal.get("github")):
+    if not links_present:
         suggestions.append("Include a LinkedIn and/or GitHub link for recruiter context.")
     if education and isinstance(education[0], str) and "-" not in education[0] and "202" not in education[0]:
         suggestions.append("Normalize education entries with degree, institution, and graduation year.")
@@ -151,12 +412,12 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
         "overall_formula": "0.30*completeness + 0.40*keywords + 0.30*format",
         "completeness": {
             "points": completeness,
-            "score": int(max(0, min(100, round((completeness/30)*100)))),
+            "score": completeness_score,
             "criteria": {
                 "email_ok": email_ok,
                 "phone_ok": phone_ok,
                 "link_ok": link_ok,
-                "summary_present": bool(personal.get("summary")),
+                "summary_present": summary_present,
                 "skills_count": len(skills),
                 "education_present": bool(education),
                 "experience_present": bool(experience),
@@ -168,8 +429,8 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
             "criteria": {
                 "distinct_skills": len(uniq_skills),
                 "reuse_hits": reuse_hits,
-                "has_role_signal": any(t in title_text for t in ["engineer","developer","analyst","scientist","manager","intern"]),
-                "has_seniority_signal": any(t in title_text for t in ["senior","lead","principal"]),
+                "has_role_signal": has_role_signal,
+                "has_seniority_signal": has_seniority_signal,
             },
         },
         "format": {
@@ -181,7 +442,7 @@ def calculate_ats_score_local(resume_data: Dict) -> Dict:
                 "quantified_hits": quant_hits,
                 "date_entries_with_match": date_ok,
                 "total_experience_entries": len(experience),
-                "links_present": bool(personal.get("linkedin") or personal.get("github")),
+                "links_present": links_present,
             },
         },
     }
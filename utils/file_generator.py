@@ -1,13 +1,13 @@
 import os
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
 from typing import Dict
 
-from docx import Document
-from docx.shared import Pt
-
-from jinja2 import Environment, FileSystemLoader
-
+# docx and jinja2 are imported lazily inside the functions that need them:
+# they dominate this module's import cost, and score-only sessions never
+# touch document generation. Repeat imports hit sys.modules.
 from .template_manager import (
     get_template_latex,
     format_contact_info,
@@ -23,7 +23,132 @@ OUTPUT_DIR = Path("outputs")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def generate_docx(data: Dict, template: str) -> str:
+# CSS variants per template — module constants so PDF generation doesn't
+# rebuild ~1KB style strings per call
+_CSS_MODERN = """
+    body { font-family: Helvetica, Arial, sans-serif; font-size: 12pt; color: #222; }
+    h1 { font-size: 24pt; margin: 0; color: #1563C1; }
+    h2 { font-size: 14pt; margin-top: 14pt; border-bottom: 2px solid #1563C1; text-transform: uppercase; }
+    .contact { color: #444; margin-top: 2pt; }
+    .chips span { display: inline-block; margin: 2px 6px 2px 0; padding: 2px 8px; border: 1px solid #1563C1; border-radius: 12px; font-size: 10pt; }
+    .job { margin-bottom: 8pt; }
+    .job h3 { margin: 0; font-size: 12pt; }
+    .meta { color: #666; font-size: 10pt; }
+"""
+
+_CSS_MINIMAL = """
+    body { font-family: Arial, sans-serif; font-size: 11pt; color: #222; }
+    h1 { font-size: 18pt; margin: 0; }
+    h2 { font-size: 12pt; margin-top: 10pt; color: #444; }
+    .contact { color: #555; margin-top: 2pt; }
+    .chips span { display: inline-block; margin: 1px 4px 1px 0; padding: 1px 6px; border: 1px solid #bbb; border-radius: 10px; font-size: 9pt; }
+    .job { margin-bottom: 6pt; }
+    .job h3 { margin: 0; font-size: 11pt; }
+    .meta { color: #666; font-size: 9pt; }
+"""
+
+_CSS_PROFESSIONAL = """
+    body { font-family: Georgia, 'Times New Roman', serif; font-size: 12pt; color: #111; }
+    h1 { font-size: 22pt; margin: 0; }
+    h2 { font-size: 13pt; margin-top: 12pt; border-bottom: 1px solid #ddd; }
+    .contact { color: #555; margin-top: 2pt; }
+    .chips span { display: inline-block; margin: 2px 6px 2px 0; padding: 2px 8px; border: 1px solid #ccc; border-radius: 12px; font-size: 10pt; }
+    .job { margin-bottom: 8pt; }
+    .job h3 { margin: 0; font-size: 12pt; }
+    .meta { color: #666; font-size: 10pt; }
+"""
+
+_HTML_CSS = {"modern": _CSS_MODERN, "minimal": _CSS_MINIMAL, "professional": _CSS_PROFESSIONAL}
+
+# The HTML skeleton is compiled once; renders reuse the parsed template
+# instead of re-assembling nested f-strings per call.
+_HTML_TEMPLATE_SRC = """
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset='utf-8'/>
+  <style>
+    {{ css }}
+    ul { margin-top: 4pt; }
+  </style>
+  <title>Resume</title>
+  </head>
+  <body>
+    <h1>{{ name|lex }}</h1>
+    <div class='contact'>{{ contact|lex }}</div>
+    {% if summary %}<h2>Summary</h2><p>{{ summary|lex }}</p>{% endif %}
+    {% if skills %}<h2>Skills</h2><div class='chips'>{% for s in skills %}<span>{{ s|lex }}</span>{% endfor %}</div>{% endif %}
+    {% if education %}<h2>Education</h2><ul>{% for e in education %}<li>{{ e|lex }}</li>{% endfor %}</ul>{% endif %}
+    {% if experience %}<h2>Experience</h2>{% endif %}
+    {% for j in experience %}<div class='job'><h3>{{ j.get('title','')|lex }} — {{ j.get('company','')|lex }}</h3><div class='meta'>{{ j.get('dates','')|lex }}</div><ul>{% for b in j.get('responsibilities',[]) or [] %}<li>{{ b|lex }}</li>{% endfor %}</ul></div>{% endfor %}
+    {% if projects %}<h2>Projects</h2><ul>{% for p in projects %}<li><strong>{{ p.get('name','Project')|lex }}</strong>: {{ p.get('description','')|lex }}</li>{% endfor %}</ul>{% endif %}
+  </body>
+</html>
+"""
+
+_HTML_TEMPLATE = None
+
+
+def _get_html_template():
+    global _HTML_TEMPLATE
+    if _HTML_TEMPLATE is None:
+        from jinja2 import Environment
+
+        env = Environment(autoescape=False)
+        env.filters["lex"] = latex_escape
+        _HTML_TEMPLATE = env.from_string(_HTML_TEMPLATE_SRC)
+    return _HTML_TEMPLATE
+
+
+# Per-directory Jinja environments for the LaTeX templates, built once.
+# A filesystem bytecode cache persists compiled templates across process
+# restarts, so even a cold worker skips the parse step.
+_LATEX_ENVS: Dict[str, object] = {}
+
+
+def _latex_env(directory: str):
+    env = _LATEX_ENVS.get(directory)
+    if env is None:
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+        cache_dir = OUTPUT_DIR / ".jinja_cache"
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            bcc = FileSystemBytecodeCache(str(cache_dir))
+        except Exception:
+            bcc = None
+        env = Environment(loader=FileSystemLoader(directory), bytecode_cache=bcc)
+        env.filters["lex"] = latex_escape
+        _LATEX_ENVS[directory] = env
+    return env
+
+
+def generate_docx(data: Dict, template: str, out_name: str = "resume.docx") -> str:
+    doc = _build_docx(data, template)
+    out_path = OUTPUT_DIR / out_name
+    doc.save(str(out_path))
+    return str(out_path)
+
+
+def generate_docx_bytes(data: Dict, template: str) -> bytes:
+    """Build the DOCX entirely in memory — no disk round-trip."""
+    doc = _build_docx(data, template)
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def generate_pdf_bytes(data: Dict, template: str) -> bytes:
+    """Generate the PDF and return its bytes (LaTeX still compiles on disk)."""
+    pdf_path = generate_pdf(data, template)
+    return Path(pdf_path).read_bytes()
+
+
+def _build_docx(data: Dict, template: str):
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.shared import Pt, RGBColor
+
     doc = Document()
 
     # Template-specific style settings
@@ -38,16 +163,24 @@ def generate_docx(data: Dict, template: str) -> str:
         name_size = 20; heading_size = 12; normal_size = 11
         heading_upper = False; heading_color = (0x00, 0x00, 0x00)
 
-    def set_paragraph_font(p, size):
-        for run in p.runs:
-            run.font.size = Pt(size)
+    # Named styles applied once, instead of walking every paragraph's runs
+    # and writing font attributes per run after the fact
+    styles = doc.styles
+    normal_style = styles.add_style("ATS Normal", WD_STYLE_TYPE.PARAGRAPH)
+    normal_style.base_style = styles["Normal"]
+    normal_style.font.size = Pt(normal_size)
+    bullet_style = styles.add_style("ATS Bullet", WD_STYLE_TYPE.PARAGRAPH)
+    bullet_style.base_style = styles["List Bullet"]
+    bullet_style.font.size = Pt(normal_size)
+    body_bullet = bullet_style if tpl != "minimal" else normal_style
+    heading_rgb = RGBColor(*heading_color)
 
     def add_section_heading(text):
         title = text.upper() if heading_upper else text
         h = doc.add_heading(title, level=1)
         for run in h.runs:
             run.font.size = Pt(heading_size)
-            run.font.color.rgb = __import__('docx.shared', fromlist=['RGBColor']).shared.RGBColor(*heading_color)  # type: ignore
+            run.font.color.rgb = heading_rgb
         # decorative separator for Modern
         if tpl == "modern":
             sep = doc.add_paragraph()
@@ -64,33 +197,29 @@ def generate_docx(data: Dict, template: str) -> str:
     # Contact
     contact = format_contact_info(data.get("personal_info", {}))
     if contact:
-        p = doc.add_paragraph(contact)
-        set_paragraph_font(p, normal_size)
+        doc.add_paragraph(contact, style=normal_style)
 
     # Summary
     summary = (data.get("personal_info", {}).get("summary") or "").strip()
     if summary:
         add_section_heading("Summary")
-        p = doc.add_paragraph(summary)
-        set_paragraph_font(p, normal_size)
+        doc.add_paragraph(summary, style=normal_style)
 
     # Skills
     skills = data.get("skills", []) or []
     if skills:
         add_section_heading("Skills")
         if tpl == "minimal":
-            p = doc.add_paragraph(" ".join([f"[{s}]" for s in skills]))
+            doc.add_paragraph(" ".join([f"[{s}]" for s in skills]), style=normal_style)
         else:
-            p = doc.add_paragraph(", ".join(skills))
-        set_paragraph_font(p, normal_size)
+            doc.add_paragraph(", ".join(skills), style=normal_style)
 
     # Education
     education = data.get("education", []) or []
     if education:
         add_section_heading("Education")
         for e in education:
-            para = doc.add_paragraph(str(e), style="List Bullet" if tpl != "minimal" else None)
-            set_paragraph_font(para, normal_size)
+            doc.add_paragraph(str(e), style=body_bullet)
 
     # Experience
     experience = data.get("experience", []) or []
@@ -99,11 +228,9 @@ def generate_docx(data: Dict, template: str) -> str:
         for job in experience:
             jt = job.get("title", ""); co = job.get("company", ""); dt = job.get("dates", "")
             header = f"{jt} — {co} ({dt})".strip()
-            h = doc.add_paragraph(header)
-            set_paragraph_font(h, normal_size)
+            doc.add_paragraph(header, style=normal_style)
             for b in job.get("responsibilities", []) or []:
-                para = doc.add_paragraph(b, style="List Bullet" if tpl != "minimal" else None)
-                set_paragraph_font(para, normal_size)
+                doc.add_paragraph(b, style=body_bullet)
 
     # Projects
     projects = data.get("projects", []) or []
@@ -112,34 +239,46 @@ def generate_docx(data: Dict, template: str) -> str:
         for p in projects:
             name = p.get("name", "Project"); desc = p.get("description", ""); tech = p.get("technologies", "")
             line = name + (f" ({tech})" if tech else "")
-            lp = doc.add_paragraph(line)
-            set_paragraph_font(lp, normal_size)
+            doc.add_paragraph(line, style=normal_style)
             if desc:
-                dp = doc.add_paragraph(desc, style="List Bullet" if tpl != "minimal" else None)
-                set_paragraph_font(dp, normal_size)
+                doc.add_paragraph(desc, style=body_bullet)
 
-    out_path = OUTPUT_DIR / "resume.docx"
-    doc.save(str(out_path))
-    return str(out_path)
+    return doc
 
 
-def generate_pdf(data: Dict, template: str) -> str:
+def generate_pdf(data: Dict, template: str, out_name: str = "resume.pdf") -> str:
     try:
-        return generate_pdf_latex(data, template)
+        return generate_pdf_latex(data, template, out_name)
     except Exception:
         try:
-            return generate_pdf_html(data, template)
+            return generate_pdf_html(data, template, out_name)
         except Exception:
-            return generate_pdf_from_docx(data, template)
+            return generate_pdf_from_docx(data, template, out_name)
+
+
+def generate_all(data: Dict, templates=("professional", "modern", "minimal"), fmt: str = "pdf") -> Dict[str, str]:
+    """Render every template concurrently; returns {template: output path}.
 
+    DOCX assembly and pdflatex compiles are CPU-bound and independent per
+    template, so separate processes give near-linear speedup. Distinct
+    output names keep the runs from racing on resume.tex/resume.pdf.
+    """
+    gen = generate_docx if fmt == "docx" else generate_pdf
+    ext = "docx" if fmt == "docx" else "pdf"
+    with ProcessPoolExecutor(max_workers=len(templates)) as pool:
+        futures = {
+            tpl: pool.submit(gen, data, tpl, f"resume_{tpl}.{ext}")
+            for tpl in templates
+        }
+        return {tpl: fut.result() for tpl, fut in futures.items()}
 
-def generate_pdf_latex(data: Dict, template: str) -> str:
+
+def generate_pdf_latex(data: Dict, template: str, out_name: str = "resume.pdf") -> str:
     tex_template_path = Path(get_template_latex(template))
     if not tex_template_path.exists():
         raise FileNotFoundError(f"LaTeX template not found: {tex_template_path}")
 
-    env = Environment(loader=FileSystemLoader(str(tex_template_path.parent)))
-    env.filters["lex"] = latex_escape
+    env = _latex_env(str(tex_template_path.parent))
     j2 = env.get_template(tex_template_path.name)
 
     personal = data.get("personal_info", {})
@@ -153,36 +292,68 @@ def generate_pdf_latex(data: Dict, template: str) -> str:
         PROJECTS=format_projects_latex(data.get("projects", []) or []),
     )
 
-    out_tex = OUTPUT_DIR / "resume.tex"
-    out_pdf = OUTPUT_DIR / "resume.pdf"
+    # pdflatex names its outputs after the .tex job, so the stem of
+    # out_name drives both paths; distinct stems allow concurrent runs.
+    stem = Path(out_name).stem
+    out_tex = OUTPUT_DIR / f"{stem}.tex"
+    out_pdf = OUTPUT_DIR / f"{stem}.pdf"
     with out_tex.open("w", encoding="utf-8") as f:
         f.write(rendered)
 
-    # Compile with pdflatex if available
+    # Prefer tectonic when requested: single-pass compiles with a persistent
+    # package/format cache, so startup isn't dominated by re-reading
+    # article.cls and friends the way a bare pdflatex run is.
+    if os.getenv("ATS_USE_TECTONIC") and _is_command_available("tectonic"):
+        try:
+            subprocess.run(
+                [
+                    "tectonic",
+                    "-X",
+                    "compile",
+                    "--outdir",
+                    str(OUTPUT_DIR),
+                    str(out_tex),
+                ],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        finally:
+            cleanup_temp_files(stem)
+        return str(out_pdf)
+
+    # Fall back to pdflatex if available
     if not _is_command_available("pdflatex"):
         raise RuntimeError("pdflatex not available")
 
+    # DEVNULL instead of PIPE: the successful-run output was discarded
+    # anyway, and piping it forces the child through buffered pipe I/O.
+    # -halt-on-error makes broken documents abort instead of crawling
+    # through nonstopmode recovery; on failure, re-run once with capture
+    # so the log is available in the raised error.
+    cmd = [
+        "pdflatex",
+        "-halt-on-error",
+        "-interaction=nonstopmode",
+        f"-output-directory={str(OUTPUT_DIR)}",
+        str(out_tex),
+    ]
     try:
-        subprocess.run(
-            [
-                "pdflatex",
-                "-interaction=nonstopmode",
-                f"-output-directory={str(OUTPUT_DIR)}",
-                str(out_tex),
-            ],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        try:
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except subprocess.CalledProcessError:
+            diag = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            tail = (diag.stdout or b"")[-2000:].decode("utf-8", errors="replace")
+            raise RuntimeError(f"pdflatex failed:\n{tail}")
     finally:
-        cleanup_temp_files()
+        cleanup_temp_files(stem)
 
     return str(out_pdf)
 
 
-def generate_pdf_from_docx(data: Dict, template: str) -> str:
-    docx_path = generate_docx(data, template)
-    pdf_path = OUTPUT_DIR / "resume.pdf"
+def generate_pdf_from_docx(data: Dict, template: str, out_name: str = "resume.pdf") -> str:
+    docx_path = generate_docx(data, template, f"{Path(out_name).stem}.docx")
+    pdf_path = OUTPUT_DIR / out_name
     try:
         from docx2pdf import convert  # type: ignore
 
@@ -192,9 +363,11 @@ def generate_pdf_from_docx(data: Dict, template: str) -> str:
         raise RuntimeError("PDF generation failed (no LaTeX/HTML engine or Word automation available). Download DOCX instead.")
 
 
-def cleanup_temp_files():
+def cleanup_temp_files(stem: str = "*"):
+    # Scoped to one job's stem when given so concurrent compiles don't
+    # delete each other's aux files mid-run
     for ext in (".aux", ".log", ".out", ".toc"):
-        for p in OUTPUT_DIR.glob(f"*{ext}"):
+        for p in OUTPUT_DIR.glob(f"{stem}{ext}"):
             try:
                 p.unlink()
             except Exception:
@@ -207,95 +380,47 @@ def _is_command_available(cmd: str) -> bool:
     return which(cmd) is not None
 
 
-def generate_pdf_html(data: Dict, template: str) -> str:
-    out_pdf = OUTPUT_DIR / "resume.pdf"
+def generate_pdf_html(data: Dict, template: str, out_name: str = "resume.pdf") -> str:
+    out_pdf = OUTPUT_DIR / out_name
     html = _render_html(data, template)
+
+    # WeasyPrint first: C-backed layout, roughly an order of magnitude
+    # faster than xhtml2pdf's pure-Python HTML/CSS re-parse per call
     try:
-        from xhtml2pdf import pisa  # type: ignore
-        from io import BytesIO
-
-        result = BytesIO()
-        pisa_status = pisa.CreatePDF(html, dest=result)
-        if pisa_status.err:
-            raise RuntimeError("xhtml2pdf failed to render HTML")
-        with open(out_pdf, "wb") as f:
-            f.write(result.getvalue())
+        from weasyprint import HTML  # type: ignore
+    except Exception:
+        HTML = None  # type: ignore
+    if HTML is not None:
+        HTML(string=html).write_pdf(str(out_pdf))
         return str(out_pdf)
-    except Exception as e:
-        raise e
+
+    from xhtml2pdf import pisa  # type: ignore
+
+    result = BytesIO()
+    pisa_status = pisa.CreatePDF(html, dest=result)
+    if pisa_status.err:
+        raise RuntimeError("xhtml2pdf failed to render HTML")
+    with open(out_pdf, "wb") as f:
+        f.write(result.getvalue())
+    return str(out_pdf)
 
 
 def _render_html(data: Dict, template: str) -> str:
     personal = data.get("personal_info", {}) or {}
-    name = personal.get("name") or "Your Name"
     contact_parts = []
     for k in ["email", "phone", "linkedin", "github", "website", "location"]:
         v = personal.get(k)
         if v:
             contact_parts.append(str(v))
-    contact = " | ".join(contact_parts)
-    skills = data.get("skills", []) or []
-    education = data.get("education", []) or []
-    experience = data.get("experience", []) or []
-    projects = data.get("projects", []) or []
 
-    # CSS variants per template
     tpl = (template or "professional").lower()
-    if tpl == "modern":
-        css = """
-    body { font-family: Helvetica, Arial, sans-serif; font-size: 12pt; color: #222; }
-    h1 { font-size: 24pt; margin: 0; color: #1563C1; }
-    h2 { font-size: 14pt; margin-top: 14pt; border-bottom: 2px solid #1563C1; text-transform: uppercase; }
-    .contact { color: #444; margin-top: 2pt; }
-    .chips span { display: inline-block; margin: 2px 6px 2px 0; padding: 2px 8px; border: 1px solid #1563C1; border-radius: 12px; font-size: 10pt; }
-    .job { margin-bottom: 8pt; }
-    .job h3 { margin: 0; font-size: 12pt; }
-    .meta { color: #666; font-size: 10pt; }
-        """
-    elif tpl == "minimal":
-        css = """
-    body { font-family: Arial, sans-serif; font-size: 11pt; color: #222; }
-    h1 { font-size: 18pt; margin: 0; }
-    h2 { font-size: 12pt; margin-top: 10pt; color: #444; }
-    .contact { color: #555; margin-top: 2pt; }
-    .chips span { display: inline-block; margin: 1px 4px 1px 0; padding: 1px 6px; border: 1px solid #bbb; border-radius: 10px; font-size: 9pt; }
-    .job { margin-bottom: 6pt; }
-    .job h3 { margin: 0; font-size: 11pt; }
-    .meta { color: #666; font-size: 9pt; }
-        """
-    else:  # professional
-        css = """
-    body { font-family: Georgia, 'Times New Roman', serif; font-size: 12pt; color: #111; }
-    h1 { font-size: 22pt; margin: 0; }
-    h2 { font-size: 13pt; margin-top: 12pt; border-bottom: 1px solid #ddd; }
-    .contact { color: #555; margin-top: 2pt; }
-    .chips span { display: inline-block; margin: 2px 6px 2px 0; padding: 2px 8px; border: 1px solid #ccc; border-radius: 12px; font-size: 10pt; }
-    .job { margin-bottom: 8pt; }
-    .job h3 { margin: 0; font-size: 12pt; }
-    .meta { color: #666; font-size: 10pt; }
-        """
-
-    html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-  <meta charset='utf-8'/>
-  <style>
-    {css}
-    ul {{ margin-top: 4pt; }}
-  </style>
-  <title>Resume</title>
-  </head>
-  <body>
-    <h1>{latex_escape(name)}</h1>
-    <div class='contact'>{latex_escape(contact)}</div>
-    {f"<h2>Summary</h2><p>{latex_escape(personal.get('summary') or '')}</p>" if (personal.get('summary') or '') else ''}
-    {f"<h2>Skills</h2><div class='chips'>" + ''.join(f"<span>{latex_escape(s)}</span>" for s in skills) + "</div>" if skills else ''}
-    {"<h2>Education</h2><ul>" + ''.join(f"<li>{latex_escape(str(e))}</li>" for e in education) + "</ul>" if education else ''}
-    {"<h2>Experience</h2>" if experience else ''}
-    {''.join(f"<div class='job'><h3>{latex_escape(j.get('title',''))} — {latex_escape(j.get('company',''))}</h3><div class='meta'>{latex_escape(j.get('dates',''))}</div><ul>" + ''.join(f"<li>{latex_escape(b)}</li>" for b in (j.get('responsibilities',[]) or [])) + "</ul></div>" for j in experience)}
-    {"<h2>Projects</h2><ul>" + ''.join(f"<li><strong>{latex_escape(p.get('name','Project'))}</strong>: {latex_escape(p.get('description',''))}</li>" for p in projects) + "</ul>" if projects else ''}
-  </body>
-</html>
-"""
-    return html
+    return _get_html_template().render(
+        css=_HTML_CSS.get(tpl, _CSS_PROFESSIONAL),
+        name=(personal.get("name") or "Your Name"),
+        contact=" | ".join(contact_parts),
+        summary=(personal.get("summary") or ""),
+        skills=data.get("skills", []) or [],
+        education=[str(e) for e in (data.get("education", []) or [])],
+        experience=data.get("experience", []) or [],
+        projects=data.get("projects", []) or [],
+    )
@@ -1,18 +1,152 @@
+import copy
+import hashlib
+import io
 import os
 import json
+import time
 from typing import Dict
 
-# Optional imports; used only if OPENAI_API_KEY present
+# Optional SDKs; loaded lazily on first use so importing this module for
+# the heuristic fallback doesn't pay the openai import cost (hundreds of
+# ms on cold start).
+OpenAI = None  # type: ignore
+openai = None  # type: ignore
+_SDK_LOADED = False
+
+
+def _load_openai_sdk() -> None:
+    global _SDK_LOADED, OpenAI, openai
+    if _SDK_LOADED:
+        return
+    _SDK_LOADED = True
+    try:
+        # New SDK (>=1.0)
+        from openai import OpenAI as _OpenAI  # type: ignore
+        OpenAI = _OpenAI
+    except Exception:
+        OpenAI = None  # type: ignore
+    try:
+        # Legacy SDK (<1.0)
+        import openai as _openai  # type: ignore
+        openai = _openai
+    except Exception:
+        openai = None  # type: ignore
+
+
 try:
-    # New SDK (>=1.0)
-    from openai import OpenAI  # type: ignore
+    from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential  # type: ignore
 except Exception:
-    OpenAI = None  # type: ignore
+    retry = None  # type: ignore
 try:
-    # Legacy SDK (<1.0)
-    import openai  # type: ignore
+    import orjson  # type: ignore
 except Exception:
-    openai = None  # type: ignore
+    orjson = None  # type: ignore
+
+
+def _json_dumps_compact(obj) -> str:
+    """Compact JSON string via orjson when available, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_loads(text: str):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _retryable(fn):
+    """Wrap an OpenAI call with exponential backoff on transient errors.
+
+    Only rate-limit/timeout/connection errors are retried; auth and
+    bad-request errors bubble immediately so the heuristic fallback in
+    generate_recommendations still triggers without delay.
+    """
+    if retry is None or openai is None:
+        return fn
+    transient = tuple(
+        exc for exc in (
+            getattr(openai, "RateLimitError", None),
+            getattr(openai, "APITimeoutError", None),
+            getattr(openai, "APIConnectionError", None),
+        )
+        if isinstance(exc, type)
+    )
+    if not transient:
+        return fn
+    return retry(
+        wait=wait_exponential(multiplier=1, max=8),
+        stop=stop_after_attempt(4),
+        retry=retry_if_exception_type(transient),
+        reraise=True,
+    )(fn)
+
+
+# Lazily-built module singleton: client construction sets up an httpx pool
+# and SSL context, which is worth reusing across recommendation calls.
+_OPENAI_CLIENT = None
+
+
+def _get_client():
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        _load_openai_sdk()
+        if OpenAI is None:
+            raise RuntimeError("OpenAI SDK not available")
+        _OPENAI_CLIENT = OpenAI()
+    return _OPENAI_CLIENT
+
+
+_RECOMMENDATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "recommendations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "title": {"type": "string"},
+                    "detail": {"type": "string"},
+                    "impact_estimate": {"type": "string"},
+                    "category": {"type": "string"}
+                },
+                "required": ["id", "title", "detail", "impact_estimate"]
+            }
+        },
+        "keywords_to_add": {"type": "array", "items": {"type": "string"}},
+        "fields_changed_suggestion": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["summary", "recommendations", "keywords_to_add", "fields_changed_suggestion"]
+}
+
+
+# TTL cache for LLM-backed recommendations keyed on a digest of the inputs:
+# a hit saves a full network round trip, and the TTL keeps results from
+# going stale across long-lived sessions. Plain dict so there is no hard
+# dependency on cachetools.
+_REC_CACHE: Dict[bytes, tuple] = {}
+_REC_CACHE_MAX = 64
+_REC_TTL_SECONDS = 3600.0
+
+
+def _rec_cache_get(key: bytes):
+    entry = _REC_CACHE.get(key)
+    if entry is None:
+        return None
+    ts, value = entry
+    if time.monotonic() - ts > _REC_TTL_SECONDS:
+        _REC_CACHE.pop(key, None)
+        return None
+    return value
+
+
+def _rec_cache_put(key: bytes, value: Dict) -> None:
+    if len(_REC_CACHE) >= _REC_CACHE_MAX:
+        _REC_CACHE.clear()
+    _REC_CACHE[key] = (time.monotonic(), value)
 
 
 DEFAULT_PROMPT_TEMPLATE = """
@@ -44,6 +178,88 @@ Instructions:
 """
 
 
+def submit_recommendations_batch(
+    resume: Dict,
+    ats: Dict,
+    target_role: str = "",
+    custom_id: str = "resume-recs",
+    model: str = "gpt-4o-mini",
+    max_tokens: int = 1000,
+) -> str:
+    """
+    Submit a recommendations request through the OpenAI Batch API.
+
+    Intended for non-interactive runs (the user is not watching): same model
+    and output for roughly half the token cost, with results collected later
+    via retrieve_recommendations_batch. Returns the batch id. Raises if the
+    OpenAI SDK or API key is unavailable.
+    """
+    _load_openai_sdk()
+    if not os.getenv("OPENAI_API_KEY") or OpenAI is None:
+        raise RuntimeError("OpenAI SDK or API key not available for batch submission")
+
+    prompt = DEFAULT_PROMPT_TEMPLATE.format(
+        target_role=(target_role or "unspecified"),
+        resume_json=_json_dumps_compact(resume or {}),
+        ats_json=_json_dumps_compact(ats or {}),
+    )
+    line = {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": os.getenv("OPENAI_MODEL") or model,
+            "messages": [
+                {"role": "system", "content": "You are a helpful resume reviewer."},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.3,
+        },
+    }
+    client = _get_client()
+    payload = io.BytesIO(json.dumps(line).encode("utf-8") + b"\n")
+    uploaded = client.files.create(file=("recommendations.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def retrieve_recommendations_batch(batch_id: str) -> Dict:
+    """
+    Poll a recommendations batch submitted via submit_recommendations_batch.
+
+    Returns {"status": <batch status>} until the batch completes, then
+    {"status": "completed", "result": <recommendations dict>} (with "error"
+    instead of "result" if the output could not be parsed).
+    """
+    _load_openai_sdk()
+    if not os.getenv("OPENAI_API_KEY") or OpenAI is None:
+        raise RuntimeError("OpenAI SDK or API key not available for batch retrieval")
+
+    client = _get_client()
+    batch = client.batches.retrieve(batch_id)
+    status = getattr(batch, "status", "unknown")
+    if status != "completed":
+        return {"status": status}
+
+    out: Dict = {"status": "completed"}
+    try:
+        content = client.files.content(batch.output_file_id).text
+        first = json.loads(content.splitlines()[0])
+        text = first["response"]["body"]["choices"][0]["message"]["content"]
+        obj = json.loads(text)
+        if isinstance(obj, dict):
+            obj.setdefault("provider", "openai-batch")
+        out["result"] = obj
+    except Exception as e:
+        out["error"] = str(e)
+    return out
+
+
 def _heuristic_recommendations(resume: Dict, ats: Dict, target_role: str = "") -> Dict:
     """Deterministic fallback: simple heuristics to produce suggestions."""
     recs = []
@@ -105,15 +321,27 @@ def generate_recommendations(
 
     Returns a dict with keys: summary, recommendations (list), keywords_to_add (list), fields_changed_suggestion (list).
     """
-    resume_json = json.dumps(resume or {}, ensure_ascii=False, indent=2)
-    ats_json = json.dumps(ats or {}, ensure_ascii=False, indent=2)
+    # Compact serialization: indented JSON only inflates prompt tokens and
+    # serialization time, the model doesn't need the whitespace.
+    resume_json = _json_dumps_compact(resume or {})
+    ats_json = _json_dumps_compact(ats or {})
 
     if not os.getenv("OPENAI_API_KEY") or not use_openai:
         return _heuristic_recommendations(resume or {}, ats or {}, target_role)
 
+    _load_openai_sdk()
+
     # Allow environment override for model name
     model_to_use = os.getenv("OPENAI_MODEL") or model
 
+    cache_key = hashlib.blake2b(
+        f"{model_to_use}\x1f{target_role}\x1f{resume_json}\x1f{ats_json}".encode(),
+        digest_size=16,
+    ).digest()
+    cached = _rec_cache_get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
     prompt = DEFAULT_PROMPT_TEMPLATE.format(
         target_role=(target_role or "unspecified"),
         resume_json=resume_json,
@@ -129,42 +357,18 @@ def generate_recommendations(
             # Ensure API key is set via environment variable
             if api_key and not os.getenv("OPENAI_API_KEY"):
                 os.environ["OPENAI_API_KEY"] = api_key
-            client = OpenAI()
+            client = _get_client()
 
             # 1) Try Responses API with structured JSON schema for reliable parsing
             try:
-                schema = {
-                    "type": "object",
-                    "properties": {
-                        "summary": {"type": "string"},
-                        "recommendations": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "id": {"type": "string"},
-                                    "title": {"type": "string"},
-                                    "detail": {"type": "string"},
-                                    "impact_estimate": {"type": "string"},
-                                    "category": {"type": "string"}
-                                },
-                                "required": ["id", "title", "detail", "impact_estimate"]
-                            }
-                        },
-                        "keywords_to_add": {"type": "array", "items": {"type": "string"}},
-                        "fields_changed_suggestion": {"type": "array", "items": {"type": "string"}}
-                    },
-                    "required": ["summary", "recommendations", "keywords_to_add", "fields_changed_suggestion"]
-                }
-
-                r = client.responses.create(
+                r = _retryable(client.responses.create)(
                     model=model_to_use,
                     input=prompt,
                     temperature=0.3,
                     max_output_tokens=max_tokens,
                     response_format={
                         "type": "json_schema",
-                        "json_schema": {"name": "ResumeRecommendations", "schema": schema}
+                        "json_schema": {"name": "ResumeRecommendations", "schema": _RECOMMENDATION_SCHEMA}
                     },
                 )
                 # Try helper property first, then fallback to manual extraction
@@ -186,21 +390,42 @@ def generate_recommendations(
                     # If Responses API returned nothing, fall back to chat.completions
                     raise RuntimeError("Empty Responses API output")
             except Exception:
-                # 2) Fallback to Chat Completions API
-                resp = client.chat.completions.create(
-                    model=model_to_use,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful resume reviewer."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    max_tokens=max_tokens,
-                    temperature=0.3,
-                )
-                text = (resp.choices[0].message.content or "").strip()
+                # 2) Fallback to Chat Completions API — streamed, so the
+                # JSON buffer fills while the rest of the response is still
+                # in flight instead of blocking on the full payload.
+                messages = [
+                    {"role": "system", "content": "You are a helpful resume reviewer."},
+                    {"role": "user", "content": prompt},
+                ]
+                try:
+                    buf = io.StringIO()
+                    stream = _retryable(client.chat.completions.create)(
+                        model=model_to_use,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=0.3,
+                        stream=True,
+                    )
+                    for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            buf.write(delta)
+                    text = buf.getvalue().strip()
+                    if not text:
+                        raise RuntimeError("Empty streamed response")
+                except Exception:
+                    # Blocking retry for environments without streaming
+                    resp = _retryable(client.chat.completions.create)(
+                        model=model_to_use,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=0.3,
+                    )
+                    text = (resp.choices[0].message.content or "").strip()
         # Fallback to legacy API
         elif openai is not None:
             openai.api_key = api_key  # type: ignore[attr-defined]
-            response = openai.ChatCompletion.create(  # type: ignore[attr-defined]
+            response = _retryable(openai.ChatCompletion.create)(  # type: ignore[attr-defined]
                 model=model_to_use,
                 messages=[
                     {"role": "system", "content": "You are a helpful resume reviewer."},
@@ -216,18 +441,20 @@ def generate_recommendations(
             return fb
 
         try:
-            obj = json.loads(text or "{}")
+            obj = _json_loads(text or "{}")
             if isinstance(obj, dict):
                 obj.setdefault("provider", "openai")
+                _rec_cache_put(cache_key, copy.deepcopy(obj))
             return obj
         except Exception:
             import re
             m = re.search(r'(\{.*\})', text, re.DOTALL)
             if m:
                 try:
-                    obj = json.loads(m.group(1))
+                    obj = _json_loads(m.group(1))
                     if isinstance(obj, dict):
                         obj.setdefault("provider", "openai")
+                        _rec_cache_put(cache_key, copy.deepcopy(obj))
                     return obj
                 except Exception:
                     pass
@@ -1,6 +1,9 @@
+import bisect
+import functools
 import re
 import PyPDF2
 import docx
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 try:
     import fitz  # type: ignore
@@ -19,25 +22,147 @@ try:
 except Exception:
     spacy = None  # type: ignore
 
+# All patterns compiled once at import — extract_* run per upload (and per
+# line for some), and re.search/findall pay a cache lookup per call.
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_NON_DIGIT_RE = re.compile(r"\D")
+# Separators deliberately exclude newlines: the candidate scan runs over
+# the whole text, and \s would stitch digit runs on adjacent lines into
+# one bogus number
+_PHONE_CAND_RE = re.compile(r"(?:\+\d{1,3}[-. \t]*)?(?:\(?\d{2,4}\)?[-. \t]*)?\d{3,4}[-. \t]*\d{4,6}")
+# One alternation pass per line instead of five substring scans; tel is
+# word-bounded so it stops matching inside e.g. 'hotel'
+_PHONE_LABEL_RE = re.compile(r"phone|mobile|contact|\btel\b|whatsapp")
+# Scheme URLs and bare domains found in one pass; lastgroup tells which
+# alternative matched. A scheme match consumes the whole URL, so the bare
+# branch no longer re-reports the domain inside it.
+_URL_RE = re.compile(
+    r"(?P<scheme>https?://[^\s)]+)"
+    r"|(?P<bare>\b(?:www\.)?[a-zA-Z0-9-]+\.(?:com|io|ai|dev|net|org)(?:/[^\s)]*)?)"
+)
+_IN_HANDLE_RE = re.compile(r'\b(in/[\w\-]+)\b')
+_LINKEDIN_LABEL_RE = re.compile(r'(?i)linkedin\s*[:\-]?\s*([\w\-/]+)')
+_GITHUB_LABEL_RE = re.compile(r'(?i)github\s*[:\-]?\s*([\w\-/]+)')
+_SKILL_NOISE_RE = re.compile(r"\b(skills?|technical|core|competencies)\b", re.I)
+_WS_RE = re.compile(r"\s+")
+_SKILLS_SECTION_RE = re.compile(
+    r'(?is)(?:^|\n)\s*(?:skills?|technical skills?|core competencies)\s*[:\-]*\s*(.+?)(?=\n\s*\n|\n\s*(education|projects|experience)\b|$)'
+)
+_SKILLS_SPLIT_RE = re.compile(r'[\n,;|•]+')
+# One alternation instead of ten per-keyword searches per line; the word
+# boundaries also stop 'mba' firing inside unrelated words
+_DEGREE_RE = re.compile(
+    r"\b(?:bachelor(?:'s)?|master(?:'s)?|ph\.?d\.?|doctorate|associate(?:'s)?|b\.[sa]\.|m\.[sa]\.|mba)\b",
+    re.IGNORECASE,
+)
+_YEAR_RE = re.compile(r'\b\d{4}\b')
+_EDU_SECTION_RE = re.compile(
+    r'(?i)(?:education|academic background)[:\s]*(.+?)(?=\n\n|\nexperience|\nwork experience|\nskills|\nprojects|$)',
+    re.DOTALL,
+)
+_EXP_SECTION_RE = re.compile(
+    r'(?i)(?:experience|work experience|professional experience|employment)[:\s]*(.+?)(?=\n\n(?:education|skills|projects)|$)',
+    re.DOTALL,
+)
+_EXP_DATE_RE = re.compile(
+    r'(\b\d{1,2}\s*[A-Za-z]{3,9}\s*\d{4}\b|\b[A-Za-z]{3,9}\s*\d{4}\b|\b\d{4}\s*[-–]\s*(Present|\d{4})\b|\b\d{4}\b)'
+)
+_PROJ_SECTION_RE = re.compile(
+    r'(?is)(?:^|\n)\s*(projects?|personal projects?)\s*[:\-]*\s*(.+?)(?=\n\n|\n\s*(experience|education|skills)\b|$)'
+)
+_BLANK_SPLIT_RE = re.compile(r'\n\s*\n')
+_TECH_LABEL_RE = re.compile(r'(?i)(tech|technologies|stack)\s*[:\-]\s*(.+)')
+_LOCATION_LABEL_RE = re.compile(r"(?i)\b(location|based in|residing in|address)\b\s*[:\-]?\s*(.+)")
+_CITY_STATE_RE = re.compile(r"\b([A-Za-z .]+,\s*[A-Za-z .]+)\b")
+# All name-line disqualifiers in one case-insensitive alternation, so the
+# per-line checks don't lowercase and substring-scan nine keywords
+_NAME_SKIP_RE = re.compile(r"(?i)email|phone|linkedin|github|www\.|@|resume|curriculum|vitae")
+
+_SKILLS_KEYWORDS = (
+    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
+    'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git',
+    'machine learning', 'deep learning', 'nlp', 'computer vision', 'data science',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
+    'html', 'css', 'bootstrap', 'tailwind', 'sass',
+    'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'rest api', 'graphql',
+)
+
+# Optional Aho-Corasick automaton: matches every skills keyword in one
+# linear pass instead of one substring scan per keyword. Both tiers use
+# leftmost-longest, non-overlapping semantics (iter_long / longest-first
+# alternation) so parser output doesn't depend on whether the optional
+# package is installed — 'javascript' yields javascript, never java.
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None  # type: ignore
+
+if ahocorasick is not None:
+    _SKILLS_AC = ahocorasick.Automaton()
+    for _kw in _SKILLS_KEYWORDS:
+        _SKILLS_AC.add_word(_kw, _kw)
+    _SKILLS_AC.make_automaton()
+    _SKILLS_KEYWORD_RE = None
+else:
+    _SKILLS_AC = None
+    _SKILLS_KEYWORD_RE = re.compile(
+        "|".join(sorted(map(re.escape, _SKILLS_KEYWORDS), key=len, reverse=True))
+    )
+
 def extract_text_from_pdf(file):
     """Extract text from PDF file"""
     try:
+        # One read: the same buffer backs the PyPDF2 stream and, if OCR is
+        # needed, goes to fitz directly as bytes (no re-wrap, no copy)
         data = file.read()
         pdf_reader = PyPDF2.PdfReader(BytesIO(data))
-        parts = []
-        for page in pdf_reader.pages:
-            t = page.extract_text() or ""
-            parts.append(t)
-        text = "\n".join(parts)
+        pages = pdf_reader.pages
+        if not pages:
+            return ""
+        if len(pages) > 4:
+            # PdfReader resolves objects lazily off one shared stream, so
+            # pages of a single reader must not be extracted concurrently.
+            # Each worker gets its own reader over the same bytes (header/
+            # xref parsing is cheap; page extraction dominates). On failure,
+            # retry serially with a fresh reader — the shared one may hold a
+            # partially-resolved object cache by then.
+            n_pages = len(pages)
+
+            def _extract_page(i):
+                reader = PyPDF2.PdfReader(BytesIO(data))
+                return reader.pages[i].extract_text() or ""
+
+            try:
+                with ThreadPoolExecutor(max_workers=min(8, n_pages)) as pool:
+                    text = "\n".join(pool.map(_extract_page, range(n_pages)))
+            except Exception:
+                fresh = PyPDF2.PdfReader(BytesIO(data))
+                text = "\n".join((page.extract_text() or "") for page in fresh.pages)
+        else:
+            text = "\n".join((page.extract_text() or "") for page in pages)
         if len(text.strip()) >= 50 or not fitz or not pytesseract or not Image:
             return text
-        ocr_texts = []
         try:
             doc = fitz.open(stream=data, filetype="pdf")  # type: ignore
+            # 2x scale for legible OCR input; grayscale without alpha
+            # halves the raster bytes vs the default RGB pixmap
+            mat = fitz.Matrix(2, 2)  # type: ignore
+
+            # PyMuPDF is not thread-safe, so rasterize in the main thread;
+            # only the tesseract calls (subprocess-backed, and the dominant
+            # cost per page) fan out to the pool.
+            images = []
             for p in doc:
-                pix = p.get_pixmap()  # type: ignore
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)  # type: ignore
-                ocr_texts.append(pytesseract.image_to_string(img))  # type: ignore
+                pix = p.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)  # type: ignore
+                images.append(Image.frombytes("L", [pix.width, pix.height], pix.samples))  # type: ignore
+
+            def _ocr_image(img):
+                return pytesseract.image_to_string(img, config="--oem 1 --psm 6")  # type: ignore
+
+            with ThreadPoolExecutor(max_workers=min(8, max(1, len(images)))) as pool:
+                ocr_texts = list(pool.map(_ocr_image, images))
             ot = "\n".join(ocr_texts)
             return ot if len(ot.strip()) > len(text.strip()) else text
         except Exception:
@@ -45,58 +170,64 @@ def extract_text_from_pdf(file):
     except Exception as e:
         raise Exception(f"Error extracting PDF: {str(e)}")
 
+def _iter_docx_text(doc):
+    """Yield paragraph and table-cell text lazily — no intermediate lists."""
+    yield from (p.text for p in doc.paragraphs)
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                val = cell.text.strip()
+                if val:
+                    yield val
+
+
 def extract_text_from_docx(file):
     """Extract text from Word document"""
     try:
         doc = docx.Document(BytesIO(file.read()))
-        paras = [paragraph.text for paragraph in doc.paragraphs]
-        table_cells = []
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    val = cell.text.strip()
-                    if val:
-                        table_cells.append(val)
-        text = "\n".join(paras + table_cells)
-        return text
+        return "\n".join(_iter_docx_text(doc))
     except Exception as e:
         raise Exception(f"Error extracting DOCX: {str(e)}")
 
 def extract_email(text):
     """Extract email from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
+    emails = _EMAIL_RE.findall(text)
     return emails[0] if emails else None
 
-def extract_phone(text):
+def extract_phone(text, text_lower=None):
     """Extract phone number with stricter heuristics.
     - Prefer lines labeled with phone/mobile/contact.
     - Exclude sequences inside emails/URLs.
     - Keep 10–15 digit numbers (with separators)."""
+    # Work on the lowered text throughout (digits and separators are case-
+    # neutral) so the label check doesn't re-lowercase every line.
     # Remove email addresses to avoid picking numbers from them
-    scrubbed = re.sub(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", " ", text)
-    lines = scrubbed.splitlines()
+    scrubbed = _EMAIL_RE.sub(" ", text_lower if text_lower is not None else text.lower())
 
-    def normalize_digits(s: str) -> str:
-        return re.sub(r"\D", "", s)
-
-    # Candidate regex allowing separators, country code
-    cand_re = re.compile(r"(?:\+\d{1,3}[-\s.]*)?(?:\(?\d{2,4}\)?[-\s.]*)?\d{3,4}[-\s.]*\d{4,6}")
+    # One candidate pass over the whole text instead of per-line finditer;
+    # the enclosing line for the label check is found by bisecting the
+    # newline offsets, so no per-line string list is allocated.
+    line_starts = [0]
+    append = line_starts.append
+    for i, c in enumerate(scrubbed):
+        if c == "\n":
+            append(i + 1)
+    n_starts = len(line_starts)
 
     labeled = []
     unlabeled = []
-    for ln in lines:
-        if not ln.strip():
+    for m in _PHONE_CAND_RE.finditer(scrubbed):
+        cand = m.group(0).strip()
+        digits = _NON_DIGIT_RE.sub("", cand)
+        if len(digits) < 10 or len(digits) > 15:
             continue
-        for m in cand_re.finditer(ln):
-            cand = m.group(0).strip()
-            digits = normalize_digits(cand)
-            if len(digits) < 10 or len(digits) > 15:
-                continue
-            if any(k in ln.lower() for k in ["phone", "mobile", "contact", "tel", "whatsapp"]):
-                labeled.append(cand)
-            else:
-                unlabeled.append(cand)
+        idx = bisect.bisect_right(line_starts, m.start()) - 1
+        end = line_starts[idx + 1] if idx + 1 < n_starts else len(scrubbed)
+        ln = scrubbed[line_starts[idx]:end]
+        if _PHONE_LABEL_RE.search(ln):
+            labeled.append(cand)
+        else:
+            unlabeled.append(cand)
 
     chosen = labeled[0] if labeled else (unlabeled[0] if unlabeled else None)
     return chosen
@@ -104,12 +235,8 @@ def extract_phone(text):
 def extract_urls(text):
     """Extract LinkedIn/GitHub/Website URLs including bare domains without scheme."""
     urls = set()
-    # Scheme URLs
-    for m in re.findall(r'http[s]?://[^\s)]+', text):
-        urls.add(m.strip(').,;'))
-    # Bare domains (with optional path)
-    for m in re.findall(r'\b(?:www\.)?[a-zA-Z0-9-]+\.(?:com|io|ai|dev|net|org)(?:/[^\s)]*)?', text):
-        urls.add(m.strip(').,;'))
+    for m in _URL_RE.finditer(text):
+        urls.add(m.group().strip(').,;'))
 
     linkedin = None
     github = None
@@ -127,13 +254,13 @@ def extract_urls(text):
 
     # Detect bare LinkedIn handles like 'in/username' not preceded by domain
     if not linkedin:
-        m = re.search(r'\b(in/[\w\-]+)\b', text)
+        m = _IN_HANDLE_RE.search(text)
         if m:
             linkedin = 'https://www.linkedin.com/' + m.group(1)
 
     # Detect textual labels like 'LinkedIn: harshadthorat16' or 'GitHub: harshadpy'
     if not linkedin:
-        m = re.search(r'(?i)linkedin\s*[:\-]?\s*([\w\-/]+)', text)
+        m = _LINKEDIN_LABEL_RE.search(text)
         if m:
             handle = m.group(1).strip().strip('.')
             if not handle.startswith('http'):
@@ -146,7 +273,7 @@ def extract_urls(text):
 
     if not github:
         # Handle without scheme, e.g., github.com/harshadpy captured above; else look for label
-        m = re.search(r'(?i)github\s*[:\-]?\s*([\w\-/]+)', text)
+        m = _GITHUB_LABEL_RE.search(text)
         if m:
             handle = m.group(1).strip().strip('.')
             github = handle if handle.startswith('http') else f'https://github.com/{handle.lstrip("/")}'
@@ -169,58 +296,46 @@ def extract_name(text):
     lines = text.strip().split('\n')
     for line in lines[:10]:
         line = line.strip()
-        if not line:
-            continue
-        if any(k in line.lower() for k in ['email', 'phone', 'linkedin', 'github', 'www.', '@']):
-            continue
-        if any(k in line.lower() for k in ['resume', 'curriculum', 'vitae']):
+        if not line or _NAME_SKIP_RE.search(line):
             continue
         tokens = line.split()
         if 1 <= len(tokens) <= 5:
             return line
     return None
 
-def extract_skills(text):
+def _clean_skill(tok: str) -> str:
+    """Strip bullet punctuation and section-noise words from one token."""
+    t = tok.strip(" \t•-*|,:;")
+    return _WS_RE.sub(" ", _SKILL_NOISE_RE.sub("", t)).strip()
+
+
+def extract_skills(text, text_lower=None):
     """Extract skills from text.
     - Match from a Skills/Technical Skills section if present (multi-line).
     - Also scan against a known keyword list.
     - Split by common separators and clean tokens.
     - Dedupe and cap length."""
-    skills_keywords = [
-        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-        'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
-        'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git',
-        'machine learning', 'deep learning', 'nlp', 'computer vision', 'data science',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-        'html', 'css', 'bootstrap', 'tailwind', 'sass',
-        'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'rest api', 'graphql'
-    ]
-
-    def clean_token(tok: str) -> str:
-        t = tok.strip().strip('•-*|,:;').strip()
-        # Remove common noise
-        t = re.sub(r"\b(skills?|technical|core|competencies)\b", "", t, flags=re.I).strip()
-        # Normalize spacing
-        t = re.sub(r"\s+", " ", t)
-        return t
-
     found = []
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
 
-    # Keyword scan
-    for kw in skills_keywords:
-        if kw in text_lower:
-            found.append(kw)
+    # Keyword scan — one pass over the text regardless of keyword count
+    if _SKILLS_AC is not None:
+        seen_kw = set()
+        for _end, kw in _SKILLS_AC.iter_long(text_lower):
+            if kw not in seen_kw:
+                seen_kw.add(kw)
+                found.append(kw)
+    else:
+        found.extend(dict.fromkeys(_SKILLS_KEYWORD_RE.findall(text_lower)))
 
     # Section scan (capture until next blank line or next section keyword)
-    skills_section_pattern = r'(?is)(?:^|\n)\s*(?:skills?|technical skills?|core competencies)\s*[:\-]*\s*(.+?)(?=\n\s*\n|\n\s*(education|projects|experience)\b|$)'
-    m = re.search(skills_section_pattern, text)
+    m = _SKILLS_SECTION_RE.search(text)
     if m:
         block = m.group(1)
-        tokens = re.split(r'[\n,;|•]+', block)
+        tokens = _SKILLS_SPLIT_RE.split(block)
         for tok in tokens:
-            t = clean_token(tok)
+            t = _clean_skill(tok)
             if not t:
                 continue
             if len(t) > 40:
@@ -242,37 +357,34 @@ def extract_skills(text):
 def extract_education(text):
     """Extract education information"""
     education = []
-    
-    # Common degree keywords
-    degree_keywords = [
-        r'bachelor(?:\'s)?(?:\s+of)?(?:\s+science)?(?:\s+in)?',
-        r'master(?:\'s)?(?:\s+of)?(?:\s+science)?(?:\s+in)?',
-        r'phd', r'ph\.d\.', r'doctorate',
-        r'associate(?:\'s)?(?:\s+of)?',
-        r'b\.s\.', r'b\.a\.', r'm\.s\.', r'm\.a\.', r'mba'
-    ]
-    
+
     # Look for education section
-    edu_section_pattern = r'(?i)(?:education|academic background)[:\s]*(.+?)(?=\n\n|\nexperience|\nwork experience|\nskills|\nprojects|$)'
-    edu_match = re.search(edu_section_pattern, text, re.DOTALL)
+    edu_match = _EDU_SECTION_RE.search(text)
     
     if edu_match:
         edu_text = edu_match.group(1)
         
         # Split by newlines and process
         lines = edu_text.split('\n')
-        current_entry = ""
-        
+        # List accumulation instead of quadratic string concatenation
+        current_parts = []
+        has_degree = has_year = False
+
         for line in lines:
             line = line.strip()
             if line:
-                current_entry += line + " "
-                if any(re.search(keyword, current_entry, re.IGNORECASE) for keyword in degree_keywords) or re.search(r'\b\d{4}\b', current_entry):
-                    education.append(current_entry.strip())
-                    current_entry = ""
-        
-        if current_entry:
-            education.append(current_entry.strip())
+                current_parts.append(line)
+                # Scan only the newly appended line; the flags carry hits
+                # forward instead of rescanning the accumulated entry
+                has_degree = has_degree or bool(_DEGREE_RE.search(line))
+                has_year = has_year or bool(_YEAR_RE.search(line))
+                if has_degree or has_year:
+                    education.append(" ".join(current_parts))
+                    current_parts = []
+                    has_degree = has_year = False
+
+        if current_parts:
+            education.append(" ".join(current_parts))
     
     return education if education else []
 
@@ -281,8 +393,7 @@ def extract_experience(text):
     experience = []
     
     # Look for experience section
-    exp_section_pattern = r'(?i)(?:experience|work experience|professional experience|employment)[:\s]*(.+?)(?=\n\n(?:education|skills|projects)|$)'
-    exp_match = re.search(exp_section_pattern, text, re.DOTALL)
+    exp_match = _EXP_SECTION_RE.search(text)
     
     if exp_match:
         exp_text = exp_match.group(1)
@@ -298,7 +409,7 @@ def extract_experience(text):
                 if current_job["title"]:
                     experience.append(current_job.copy())
                     current_job = {"title": "", "company": "", "dates": "", "responsibilities": []}
-            elif re.search(r'(\b\d{1,2}\s*[A-Za-z]{3,9}\s*\d{4}\b|\b[A-Za-z]{3,9}\s*\d{4}\b|\b\d{4}\s*[-–]\s*(Present|\d{4})\b|\b\d{4}\b)', line):
+            elif _EXP_DATE_RE.search(line):
                 current_job["dates"] = line
             elif line.startswith(('•', '-', '*')):
                 current_job["responsibilities"].append(line.lstrip('•-* '))
@@ -315,10 +426,10 @@ def extract_experience(text):
 
 def extract_projects(text):
     projects = []
-    section = re.search(r'(?is)(?:^|\n)\s*(projects?|personal projects?)\s*[:\-]*\s*(.+?)(?=\n\n|\n\s*(experience|education|skills)\b|$)', text)
+    section = _PROJ_SECTION_RE.search(text)
     if section:
         body = section.group(2)
-        blocks = re.split(r'\n\s*\n', body)
+        blocks = _BLANK_SPLIT_RE.split(body)
         for b in blocks:
             lines = [l.strip() for l in b.split('\n') if l.strip()]
             if not lines:
@@ -328,7 +439,7 @@ def extract_projects(text):
             tech = ""
             if len(lines) > 1:
                 desc = lines[1]
-            m = re.search(r'(?i)(tech|technologies|stack)\s*[:\-]\s*(.+)', b)
+            m = _TECH_LABEL_RE.search(b)
             if m:
                 tech = m.group(2).strip()
             projects.append({"name": name, "description": desc, "technologies": tech})
@@ -336,13 +447,63 @@ def extract_projects(text):
 
 def parse_resume(text):
     """Main parser function to extract all resume information"""
-    
-    # Extract all components
-    name = extract_name(text)
-    email = extract_email(text)
-    phone = extract_phone(text)
-    linkedin, github, website = extract_urls(text)
-    skills = extract_skills(text)
+    resume_data = _parse_resume_base(text)
+    try:
+        resume_data = _enrich_with_ner_and_heuristics(text, resume_data)
+    except Exception:
+        pass
+    return resume_data
+
+
+def parse_resumes(texts):
+    """Parse many resumes, batching the NER pass through nlp.pipe.
+
+    Yields one enriched dict per input text; falls back to per-document
+    parse_resume when no model is available.
+    """
+    texts = list(texts)
+    nlp = _get_nlp()
+    if nlp is None:
+        for t in texts:
+            yield parse_resume(t)
+        return
+    data_list = [_parse_resume_base(t) for t in texts]
+    heads = (t[:2000] for t in texts)
+    if "ner" in nlp.pipe_names:
+        with nlp.select_pipes(enable=["ner"]):
+            docs = list(nlp.pipe(heads, batch_size=64))
+    else:
+        docs = list(nlp.pipe(heads, batch_size=64))
+    for t, data, doc in zip(texts, data_list, docs):
+        try:
+            _apply_ner_ents(data, doc)
+            data = _enrich_heuristics(t, data)
+        except Exception:
+            pass
+        yield data
+
+
+def _parse_resume_base(text):
+    """Regex-only extraction into the structured resume dict (no NER)."""
+    # Extract all components — lowercase once and share it. Contact
+    # details live at the top of almost every resume, so the head-only
+    # pass keeps the regex scans off the full document; the full text is
+    # only rescanned when the head comes up empty.
+    text_lower = text.lower()
+    head = text[:4096]
+    long_text = len(text) > 4096
+    name = extract_name(head)
+    email = extract_email(head) or (extract_email(text) if long_text else None)
+    phone = extract_phone(head, text_lower[:4096]) or (
+        extract_phone(text, text_lower) if long_text else None
+    )
+    linkedin, github, website = extract_urls(head)
+    if long_text and not (linkedin and github and website):
+        full_li, full_gh, full_web = extract_urls(text)
+        linkedin = linkedin or full_li
+        github = github or full_gh
+        website = website or full_web
+    skills = extract_skills(text, text_lower)
     education = extract_education(text)
     experience = extract_experience(text)
     projects = extract_projects(text)
@@ -364,48 +525,77 @@ def parse_resume(text):
         "experience": experience,
         "projects": projects
     }
+    return resume_data
 
+
+@functools.lru_cache(maxsize=1)
+def _get_nlp():
+    """Load the spaCy model once per process — it costs hundreds of ms
+    and tens of MB, and was being reloaded on every parse."""
+    if not spacy:
+        return None
     try:
-        resume_data = _enrich_with_ner_and_heuristics(text, resume_data)
+        # Only ent.label_ is ever read, so skip the tagging/parsing pipes
+        return spacy.load(  # type: ignore
+            "en_core_web_sm",
+            exclude=["tagger", "parser", "lemmatizer", "attribute_ruler"],
+        )
     except Exception:
-        pass
-    return resume_data
+        try:
+            return spacy.blank("en")  # type: ignore
+        except Exception:
+            return None
 
 
 def _enrich_with_ner_and_heuristics(text, data):
-    loc = data.get("personal_info", {}).get("location") or ""
-    nm = data.get("personal_info", {}).get("name") or ""
-    nlp = None
-    if spacy:
-        try:
-            nlp = spacy.load("en_core_web_sm")  # type: ignore
-        except Exception:
-            try:
-                nlp = spacy.blank("en")  # type: ignore
-            except Exception:
-                nlp = None
+    # Cheap regex heuristics first: when they already fill name and
+    # location, the model load and NER pass are skipped entirely
+    data = _enrich_heuristics(text, data)
+    pi = data["personal_info"]
+    if pi.get("name") and pi.get("location"):
+        return data
+    nlp = _get_nlp()
     if nlp:
-        doc = nlp(text[:2000])
-        if not nm:
-            for ent in doc.ents:
-                if ent.label_ == "PERSON" and 2 <= len(ent.text.split()) <= 5:
-                    nm = ent.text
-                    break
-        if not loc:
-            for ent in doc.ents:
-                if ent.label_ in ("GPE", "LOC"):
-                    loc = ent.text
-                    break
+        if "ner" in nlp.pipe_names:
+            with nlp.select_pipes(enable=["ner"]):
+                doc = nlp(text[:2000])
+        else:
+            doc = nlp(text[:2000])
+        _apply_ner_ents(data, doc)
+    return data
+
+
+def _apply_ner_ents(data, doc):
+    """Fill missing name/location from an already-processed spaCy doc."""
+    pi = data["personal_info"]
+    nm = pi.get("name") or ""
+    loc = pi.get("location") or ""
+    # One pass over the entities, stopping once both slots are filled
+    for ent in doc.ents:
+        if not nm and ent.label_ == "PERSON" and 2 <= len(ent.text.split()) <= 5:
+            nm = ent.text
+        elif not loc and ent.label_ in ("GPE", "LOC"):
+            loc = ent.text
+        if nm and loc:
+            break
+    if nm:
+        pi["name"] = nm
+    if loc:
+        pi["location"] = loc
+    return data
+
+
+def _enrich_heuristics(text, data):
+    """Regex-only fallbacks that run whether or not a model is loaded."""
+    loc = data.get("personal_info", {}).get("location") or ""
     if not loc:
-        m = re.search(r"(?i)\b(location|based in|residing in|address)\b\s*[:\-]?\s*(.+)", text)
+        m = _LOCATION_LABEL_RE.search(text)
         if m:
             loc = m.group(2).split("\n")[0].strip().strip(",")
     if not loc:
-        m = re.search(r"\b([A-Za-z .]+,\s*[A-Za-z .]+)\b", text)
+        m = _CITY_STATE_RE.search(text)
         if m and len(m.group(1)) <= 40:
             loc = m.group(1).strip()
-    if nm:
-        data["personal_info"]["name"] = nm
     if loc:
         data["personal_info"]["location"] = loc
     return data
\ No newline at end of file
@@ -1,7 +1,11 @@
+import functools
+import re
 from typing import Dict, List
 
 
+@functools.lru_cache(maxsize=1)
 def get_available_templates() -> Dict[str, Dict]:
+    # Callers only read the registry, so handing out the cached dict is safe
     return {
         "professional": {
             "name": "Professional",
@@ -42,29 +46,26 @@ def format_contact_info(personal_info: Dict) -> str:
 
 
 def format_experience_latex(experience: List[Dict]) -> str:
-    lines = []
-    for job in experience:
-        title = job.get("title", "")
-        company = job.get("company", "")
-        dates = job.get("dates", "")
-        lines.append(
-            f"\\textbf{{{latex_escape(title)}}} \\hfill {latex_escape(dates)}\\\n"
-            f"{latex_escape(company)}\\\n\\begin{{itemize}}"
-        )
-        for b in job.get("responsibilities", []) or []:
-            lines.append(f"  \\item {latex_escape(b)}")
-        lines.append("\\end{itemize}")
-    return "\n".join(lines)
+    esc = latex_escape  # local binding — called per field in the loops
+
+    def _job_blocks():
+        for job in experience:
+            yield (
+                f"\\textbf{{{esc(job.get('title', ''))}}} \\hfill {esc(job.get('dates', ''))}\\\n"
+                f"{esc(job.get('company', ''))}\\\n\\begin{{itemize}}"
+            )
+            yield from (f"  \\item {esc(b)}" for b in job.get("responsibilities") or ())
+            yield "\\end{itemize}"
+
+    return "\n".join(_job_blocks())
 
 
 def format_education_latex(education: List[str]) -> str:
     if not education:
         return ""
-    lines = ["\\begin{itemize}"]
-    for e in education:
-        lines.append(f"  \\item {latex_escape(e)}")
-    lines.append("\\end{itemize}")
-    return "\n".join(lines)
+    esc = latex_escape
+    body = "\n".join(f"  \\item {esc(e)}" for e in education)
+    return f"\\begin{{itemize}}\n{body}\n\\end{{itemize}}"
 
 
 def format_skills_latex(skills: List[str]) -> str:
@@ -74,35 +75,44 @@ def format_skills_latex(skills: List[str]) -> str:
 def format_projects_latex(projects: List[Dict]) -> str:
     if not projects:
         return ""
-    lines = ["\\begin{itemize}"]
-    for p in projects:
-        name = p.get("name", "Project")
-        desc = p.get("description", "")
-        tech = p.get("technologies", "")
-        body = f"\\textbf{{{latex_escape(name)}}}: {latex_escape(desc)}"
-        if tech:
-            body += f" (Tech: {latex_escape(tech)})"
-        lines.append(f"  \\item {body}")
-    lines.append("\\end{itemize}")
-    return "\n".join(lines)
+    esc = latex_escape
+
+    def _items():
+        for p in projects:
+            body = f"\\textbf{{{esc(p.get('name', 'Project'))}}}: {esc(p.get('description', ''))}"
+            tech = p.get("technologies", "")
+            if tech:
+                body += f" (Tech: {esc(tech)})"
+            yield f"  \\item {body}"
+
+    return "\\begin{itemize}\n" + "\n".join(_items()) + "\n\\end{itemize}"
+
+
+# Built once; str.translate does the whole escape in one C-level pass and
+# never rescans replacement text, so backslash can live in the same table
+_LATEX_TRANS = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+})
+
+
+# Most resume fields contain no reserved characters at all; one regex scan
+# lets those return unchanged with no new string built
+_LATEX_TRIGGER_RE = re.compile(r"[\\&%$#_{}~^]")
 
 
 def latex_escape(text: str) -> str:
     if not text:
         return ""
-    rep = {
-        "\\": r"\\textbackslash{}",
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
-    }
-    out = []
-    for ch in str(text):
-        out.append(rep.get(ch, ch))
-    return "".join(out)
+    s = str(text)
+    if not _LATEX_TRIGGER_RE.search(s):
+        return s
+    return s.translate(_LATEX_TRANS)